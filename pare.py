@@ -7,6 +7,18 @@ import requests
 import subprocess
 import json
 import sys
+import io
+import time
+import hashlib
+import threading
+import multiprocessing
+import sqlite3
+import mmap
+import struct
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
+from queue import Queue, Empty
 from PIL import Image, ImageTk
 
 # Determine base directory for assets
@@ -19,6 +31,9 @@ def get_asset_path(filename):
 # Config file
 CONFIG_FILE = "config.json"
 
+# Cache directory (artwork, metadata, ...)
+CACHE_DIR = "cache"
+
 class Config:
     """Manage application configuration"""
     def __init__(self):
@@ -26,6 +41,11 @@ class Config:
         self.tvdb_api_key = ""
         self.tvdb_series_id = ""
         self.series_name = ""
+        self.tvdb_max_concurrency = 4
+        self.tvdb_rate_limit = 5.0
+        self.tvdb_refresh_hours = 24
+        self.playback_worker = False
+        self.shared_index_path = ""
         self.load()
     
     def load(self):
@@ -38,9 +58,23 @@ class Config:
                     self.tvdb_api_key = data.get('tvdb_api_key', '')
                     self.tvdb_series_id = data.get('tvdb_series_id', '')
                     self.series_name = data.get('series_name', '')
+                    self.tvdb_max_concurrency = self._number(data, 'tvdb_max_concurrency', 4, int, 1)
+                    self.tvdb_rate_limit = self._number(data, 'tvdb_rate_limit', 5.0, float, 0.1)
+                    self.tvdb_refresh_hours = data.get('tvdb_refresh_hours', 24)
+                    self.playback_worker = data.get('playback_worker', False)
+                    self.shared_index_path = data.get('shared_index_path', '')
             except Exception as e:
                 print(f"Error loading config: {e}")
     
+    @staticmethod
+    def _number(data, key, default, kind, minimum):
+        """Numeric setting, default if invalid, at least minimum"""
+        try:
+            return max(minimum, kind(data.get(key, default)))
+        except (TypeError, ValueError):
+            print(f"Invalid {key} in config, using {default}")
+            return default
+    
     def save(self):
         """Save config to file"""
         try:
@@ -49,7 +83,12 @@ class Config:
                     'series_folder': self.series_folder,
                     'tvdb_api_key': self.tvdb_api_key,
                     'tvdb_series_id': self.tvdb_series_id,
-                    'series_name': self.series_name
+                    'series_name': self.series_name,
+                    'tvdb_max_concurrency': self.tvdb_max_concurrency,
+                    'tvdb_rate_limit': self.tvdb_rate_limit,
+                    'tvdb_refresh_hours': self.tvdb_refresh_hours,
+                    'playback_worker': self.playback_worker,
+                    'shared_index_path': self.shared_index_path
                 }, f, indent=4)
         except Exception as e:
             print(f"Error saving config: {e}")
@@ -104,14 +143,16 @@ except Exception as e:
     VLC_AVAILABLE = False
     print(f"⚠ Unexpected VLC error: {e}")
 
+# Video file extensions
+VIDEO_EXTENSIONS = ('.mp4', '.mkv', '.avi', '.mov', '.m4v', '.wmv', '.flv')
+
 def get_all_episodes(folder):
     """Get all video files from folder"""
-    video_extensions = ('.mp4', '.mkv', '.avi', '.mov', '.m4v', '.wmv', '.flv')
     episodes = []
     
     for root, dirs, files in os.walk(folder):
         for file in files:
-            if file.lower().endswith(video_extensions):
+            if file.lower().endswith(VIDEO_EXTENSIONS):
                 episodes.append(os.path.join(root, file))
     
     return episodes
@@ -130,22 +171,1143 @@ def parse_episode_info(filename):
     
     return None, None
 
+# Packed season/episode: flag bit, 15-bit season, 16-bit episode
+EPISODE_KNOWN = 1 << 31
+
+def pack_episode(season, episode):
+    """Pack season and episode numbers into one int (0 if unknown)"""
+    if season is None or episode is None or season < 0 or episode < 0:
+        return 0
+    return EPISODE_KNOWN | (min(season, 0x7FFF) << 16) | min(episode, 0xFFFF)
+
+def unpack_episode(packed):
+    """Unpack season and episode numbers, (None, None) if unknown"""
+    if not packed & EPISODE_KNOWN:
+        return None, None
+    return (packed >> 16) & 0x7FFF, packed & 0xFFFF
+
+class EpisodeIndex:
+    """Compact index of video files
+
+    Directories are stored once in a table. Each file is a directory id,
+    a slice of one shared UTF-8 name buffer and a packed season/episode,
+    so a large library costs a few dozen bytes per file instead of a full
+    path string each. Entries support O(1) random access.
+    """
+    __slots__ = ('folder', 'dirs', 'dir_ids', 'name_data', 'name_offsets', 'numbers', 'dir_mtimes', '_dir_lookup')
+    
+    def __init__(self, folder=''):
+        self.folder = folder
+        self.dirs = []
+        # Every scanned directory's mtime, for staleness checks of exported indexes
+        self.dir_mtimes = {}
+        self._dir_lookup = {}
+        self.dir_ids = array('I')
+        self.name_data = bytearray()
+        self.name_offsets = array('I', [0])
+        self.numbers = array('I')
+    
+    @classmethod
+    def build(cls, folder, index=None, progress=None, cancelled=None, progress_interval=0.1):
+        """Scan a folder into an index
+
+        progress(count) is called when the first episode is found and then
+        at most every progress_interval seconds; the scan stops early when
+        cancelled() returns True.
+        """
+        if index is None:
+            index = cls(folder)
+        last_report, last_count = None, 0
+        for root, dirs, files in os.walk(folder):
+            if cancelled and cancelled():
+                break
+            try:
+                index.dir_mtimes[root] = os.stat(root).st_mtime_ns
+            except OSError:
+                pass
+            dir_id = None
+            for file in files:
+                if file.lower().endswith(VIDEO_EXTENSIONS):
+                    if dir_id is None:
+                        dir_id = index.add_dir(root)
+                    index.add(dir_id, file)
+            
+            if progress and len(index) != last_count:
+                now = time.monotonic()
+                if last_report is None or now - last_report >= progress_interval:
+                    last_report, last_count = now, len(index)
+                    progress(last_count)
+        return index
+    
+    def add_dir(self, path):
+        """Add a directory to the table, returns its id"""
+        dir_id = self._dir_lookup.get(path)
+        if dir_id is None:
+            dir_id = len(self.dirs)
+            self.dirs.append(sys.intern(path))
+            self._dir_lookup[path] = dir_id
+        return dir_id
+    
+    def dir_id(self, path):
+        """Id of a directory that holds videos, None if it has none"""
+        return self._dir_lookup.get(path)
+    
+    def add(self, dir_id, name, numbers=None):
+        """Add a file in a known directory"""
+        if numbers is None:
+            numbers = pack_episode(*parse_episode_info(name))
+        self.name_data += name.encode('utf-8', 'surrogateescape')
+        self.name_offsets.append(len(self.name_data))
+        self.dir_ids.append(dir_id)
+        # Appended last: len() only counts complete entries
+        self.numbers.append(numbers)
+    
+    def __len__(self):
+        return len(self.numbers)
+    
+    def __getitem__(self, i):
+        return self.path(i)
+    
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.path(i)
+    
+    def name(self, i):
+        """File name of entry i"""
+        return self.name_data[self.name_offsets[i]:self.name_offsets[i + 1]].decode('utf-8', 'surrogateescape')
+    
+    def path(self, i):
+        """Full path of entry i"""
+        return os.path.join(self.dirs[self.dir_ids[i]], self.name(i))
+    
+    def season_episode(self, i):
+        """Season and episode of entry i, (None, None) if unknown"""
+        return unpack_episode(self.numbers[i])
+    
+    def random_entry(self, rng=random):
+        """Pick a random entry id, None if empty"""
+        if not len(self):
+            return None
+        return rng.randrange(len(self))
+    
+    def entries_by_number(self):
+        """Map packed season/episode to entry ids"""
+        lookup = {}
+        for i, packed in enumerate(self.numbers):
+            if packed:
+                lookup.setdefault(packed, []).append(i)
+        return lookup
+    
+    def dir_counts(self):
+        """Recursive video counts per directory, keyed by path relative to the folder"""
+        per_dir = {}
+        for dir_id in self.dir_ids:
+            per_dir[dir_id] = per_dir.get(dir_id, 0) + 1
+        
+        counts = {}
+        for dir_id, count in per_dir.items():
+            rel = os.path.relpath(self.dirs[dir_id], self.folder)
+            while True:
+                counts[rel] = counts.get(rel, 0) + count
+                if rel == '.':
+                    break
+                rel = os.path.dirname(rel) or '.'
+        return counts
+
+# Container formats whose tags we can read
+TAGGED_EXTENSIONS = ('.mkv', '.mp4', '.m4v', '.mov')
+
+# Matroska element IDs
+MKV_EBML = 0x1A45DFA3
+MKV_SEGMENT = 0x18538067
+MKV_SEEKHEAD = 0x114D9B74
+MKV_SEEK = 0x4DBB
+MKV_SEEK_ID = 0x53AB
+MKV_SEEK_POSITION = 0x53AC
+MKV_INFO = 0x1549A966
+MKV_TITLE = 0x7BA9
+MKV_CLUSTER = 0x1F43B675
+MKV_TAGS = 0x1254C367
+MKV_TAG = 0x7373
+MKV_TARGETS = 0x63C0
+MKV_TARGET_TYPE_VALUE = 0x68CA
+MKV_SIMPLE_TAG = 0x67C8
+MKV_TAG_NAME = 0x45A3
+MKV_TAG_STRING = 0x4487
+
+# Largest element/atom we are willing to read into memory
+MAX_TAG_READ = 1024 * 1024
+
+def _ebml_vint(f, keep_marker=False):
+    """Read an EBML variable-length integer, returns (value, is_unknown_size)"""
+    first = f.read(1)
+    if not first:
+        raise EOFError
+    b = first[0]
+    length, mask = 1, 0x80
+    while length <= 8 and not b & mask:
+        mask >>= 1
+        length += 1
+    if length > 8:
+        raise ValueError("invalid EBML integer")
+    rest = f.read(length - 1)
+    if len(rest) != length - 1:
+        raise EOFError
+    value = b if keep_marker else b & (mask - 1)
+    for x in rest:
+        value = (value << 8) | x
+    unknown = not keep_marker and value == (1 << (7 * length)) - 1
+    return value, unknown
+
+def _ebml_element(f):
+    """Read an element header, returns (id, size or None if unknown)"""
+    element_id, _ = _ebml_vint(f, keep_marker=True)
+    size, unknown = _ebml_vint(f)
+    return element_id, None if unknown else size
+
+def _ebml_children(data):
+    """Yield (id, payload) for the elements in a byte string"""
+    f = io.BytesIO(data)
+    while f.tell() < len(data):
+        try:
+            element_id, size = _ebml_element(f)
+        except (EOFError, ValueError):
+            return
+        if size is None:
+            return
+        yield element_id, f.read(size)
+
+def _tag_int(value):
+    """Non-negative number from a tag value like "3" or "3/10", else None"""
+    try:
+        number = int(str(value).strip().split('/')[0])
+    except ValueError:
+        return None
+    return number if number >= 0 else None
+
+def _read_mkv_tags(f, file_size):
+    """Read Matroska Tags (and Info title), seeking via the SeekHead"""
+    f.seek(0)
+    element_id, size = _ebml_element(f)
+    if element_id != MKV_EBML or size is None:
+        return {}
+    f.seek(size, 1)
+    element_id, size = _ebml_element(f)
+    if element_id != MKV_SEGMENT:
+        return {}
+    segment_start = f.tell()
+    segment_end = segment_start + size if size is not None else file_size
+    
+    result = {}
+    tags_positions = []
+    pos = segment_start
+    # Level-1 elements before the first cluster hold everything we need
+    for _ in range(64):
+        if pos >= segment_end:
+            break
+        f.seek(pos)
+        element_id, size = _ebml_element(f)
+        data_start = f.tell()
+        if element_id == MKV_CLUSTER or size is None:
+            break
+        if element_id in (MKV_SEEKHEAD, MKV_INFO) and size <= MAX_TAG_READ:
+            data = f.read(size)
+            if element_id == MKV_SEEKHEAD:
+                for seek_id, seek in _ebml_children(data):
+                    if seek_id != MKV_SEEK:
+                        continue
+                    fields = dict(_ebml_children(seek))
+                    if int.from_bytes(fields.get(MKV_SEEK_ID, b''), 'big') == MKV_TAGS:
+                        tags_positions.append(segment_start + int.from_bytes(fields.get(MKV_SEEK_POSITION, b''), 'big'))
+            else:
+                for child_id, child in _ebml_children(data):
+                    if child_id == MKV_TITLE:
+                        result['title'] = child.decode('utf-8', 'replace')
+        elif element_id == MKV_TAGS:
+            tags_positions.append(pos)
+        pos = data_start + size
+    
+    for tags_pos in tags_positions:
+        if tags_pos >= file_size:
+            continue
+        f.seek(tags_pos)
+        element_id, size = _ebml_element(f)
+        if element_id != MKV_TAGS or size is None or size > MAX_TAG_READ:
+            continue
+        result.update(_parse_mkv_tags(f.read(size)))
+    return result
+
+def _parse_mkv_tags(data):
+    """Map Matroska tags to season/episode/title"""
+    result = {}
+    for tag_id, tag in _ebml_children(data):
+        if tag_id != MKV_TAG:
+            continue
+        # Default target is 50 (episode / movie)
+        target = 50
+        simple_tags = []
+        for child_id, child in _ebml_children(tag):
+            if child_id == MKV_TARGETS:
+                for target_id, value in _ebml_children(child):
+                    if target_id == MKV_TARGET_TYPE_VALUE:
+                        target = int.from_bytes(value, 'big')
+            elif child_id == MKV_SIMPLE_TAG:
+                simple_tags.append(child)
+        
+        while simple_tags:
+            fields = {}
+            for field_id, value in _ebml_children(simple_tags.pop()):
+                if field_id == MKV_SIMPLE_TAG:
+                    simple_tags.append(value)
+                else:
+                    fields[field_id] = value
+            name = fields.get(MKV_TAG_NAME, b'').decode('utf-8', 'replace').upper()
+            value = fields.get(MKV_TAG_STRING, b'').decode('utf-8', 'replace')
+            
+            if name == 'PART_NUMBER':
+                number = _tag_int(value)
+                if number is not None:
+                    result['season' if target >= 60 else 'episode'] = number
+            elif name in ('SEASON', 'SEASON_NUMBER'):
+                number = _tag_int(value)
+                if number is not None:
+                    result['season'] = number
+            elif name in ('EPISODE', 'EPISODE_NUMBER', 'EPISODE_SORT'):
+                number = _tag_int(value)
+                if number is not None:
+                    result['episode'] = number
+            elif name == 'TITLE' and target <= 50 and value:
+                result['title'] = value
+    return result
+
+def _mp4_boxes(f, start, end):
+    """Yield (type, data_start, box_end) for the boxes in a range, reading headers only"""
+    pos = start
+    while pos + 8 <= end:
+        f.seek(pos)
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        size, kind = struct.unpack('>I4s', header)
+        header_size = 8
+        if size == 1:
+            size = struct.unpack('>Q', f.read(8))[0]
+            header_size = 16
+        elif size == 0:
+            size = end - pos
+        if size < header_size:
+            return
+        yield kind, pos + header_size, min(pos + size, end)
+        pos += size
+
+def _mp4_find(f, start, end, kind):
+    for box_kind, data_start, box_end in _mp4_boxes(f, start, end):
+        if box_kind == kind:
+            return data_start, box_end
+    return None
+
+def _read_mp4_tags(f, file_size):
+    """Read iTunes-style moov/udta/meta/ilst tags (tvsn, tves, ©nam)"""
+    moov = _mp4_find(f, 0, file_size, b'moov')
+    udta = moov and _mp4_find(f, moov[0], moov[1], b'udta')
+    meta = udta and _mp4_find(f, udta[0], udta[1], b'meta')
+    if not meta:
+        return {}
+    
+    # meta is a full box in MP4 but not in QuickTime files
+    f.seek(meta[0])
+    children_start = meta[0] if f.read(8)[4:8] == b'hdlr' else meta[0] + 4
+    ilst = _mp4_find(f, children_start, meta[1], b'ilst')
+    if not ilst:
+        return {}
+    
+    result = {}
+    wanted = {b'tvsn': 'season', b'tves': 'episode', b'\xa9nam': 'title'}
+    for kind, start, end in _mp4_boxes(f, ilst[0], ilst[1]):
+        if kind not in wanted:
+            continue
+        data = _mp4_find(f, start, end, b'data')
+        if not data or data[1] - data[0] > 64 * 1024:
+            continue
+        f.seek(data[0])
+        # Skip type indicator and locale
+        payload = f.read(data[1] - data[0])[8:]
+        if kind == b'\xa9nam':
+            result['title'] = payload.decode('utf-8', 'replace')
+        elif payload:
+            result[wanted[kind]] = int.from_bytes(payload, 'big')
+    return result
+
+def read_container_tags(path):
+    """Read season/episode/title tags from an MKV or MP4 header
+
+    Only the few elements/atoms that hold tags are read, never the media
+    data. Returns a dict with any of 'season', 'episode', 'title'.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    try:
+        with open(path, 'rb') as f:
+            file_size = os.fstat(f.fileno()).st_size
+            if ext == '.mkv':
+                return _read_mkv_tags(f, file_size)
+            if ext in ('.mp4', '.m4v', '.mov'):
+                return _read_mp4_tags(f, file_size)
+    except (OSError, EOFError, ValueError, struct.error) as e:
+        print(f"Error reading tags from {os.path.basename(path)}: {e}")
+    return {}
+
+# Container tag results from previous scans
+TAG_CACHE_FILE = os.path.join(CACHE_DIR, 'tags.json')
+
+class TagCache:
+    """Container tag results keyed by path, invalidated by size and mtime"""
+    def __init__(self, path=TAG_CACHE_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    self.entries = json.load(f)
+            except Exception as e:
+                print(f"Error loading tag cache: {e}")
+    
+    def get(self, path, stat):
+        """Cached tags for an unchanged file, or None"""
+        with self.lock:
+            entry = self.entries.get(path)
+        if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+            return entry[2]
+        return None
+    
+    def put(self, path, stat, tags):
+        with self.lock:
+            self.entries[path] = [stat.st_size, stat.st_mtime_ns, tags]
+    
+    def save(self):
+        """Save cache to file"""
+        with self.lock:
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                tmp_path = self.path + '.tmp'
+                with open(tmp_path, 'w') as f:
+                    json.dump(self.entries, f)
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                print(f"Error saving tag cache: {e}")
+
+def identify_from_tags(index, cache, cancelled=None, max_workers=8):
+    """Fill in season/episode from container tags where the filename had none
+
+    Tags are read in a worker pool; results go into the index's packed
+    numbers (and so into exported index files). Returns the number of
+    entries identified.
+    """
+    todo = [
+        i for i, packed in enumerate(index.numbers)
+        if not packed and index.name(i).lower().endswith(TAGGED_EXTENSIONS)
+    ]
+    if not todo:
+        return 0
+    
+    def identify(i):
+        if cancelled and cancelled():
+            return i, None
+        path = index.path(i)
+        try:
+            stat = os.stat(path)
+            tags = cache.get(path, stat)
+            if tags is None:
+                tags = read_container_tags(path)
+                cache.put(path, stat, tags)
+        except Exception as e:
+            # One bad file must not abort the whole pass
+            print(f"Error reading tags from {path}: {e}")
+            return i, None
+        return i, tags
+    
+    found = 0
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='tags') as pool:
+        for i, tags in pool.map(identify, todo):
+            packed = pack_episode(tags.get('season'), tags.get('episode')) if tags else 0
+            if packed:
+                index.numbers[i] = packed
+                found += 1
+    cache.save()
+    return found
+
+def local_index_path(folder):
+    """Index file kept in the cache after each scan of a folder (for --stats)"""
+    digest = hashlib.sha1(os.path.abspath(folder).encode('utf-8', 'surrogateescape')).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, f'library-{digest}.idx')
+
+# Shared index file: header, directory records, file records, string table
+INDEX_MAGIC = b'PARE'
+INDEX_VERSION = 1
+INDEX_HEADER = struct.Struct('<4sHHIIQQQQ')
+INDEX_DIR = struct.Struct('<IIq')      # path offset, path length, mtime (ns)
+INDEX_FILE = struct.Struct('<IIHxxI')  # dir id, name offset, name length, packed season/episode
+
+def write_index_file(path, index):
+    """Export an EpisodeIndex to a shared index file (atomic replace)
+
+    Directory paths are stored relative to the series folder, so clients
+    that mount the share at different paths can use the same file.
+    """
+    dirs = list(index.dirs) + [d for d in index.dir_mtimes if index.dir_id(d) is None]
+    strings = bytearray()
+    
+    dir_records = bytearray(INDEX_DIR.size * len(dirs))
+    for dir_id, dir_path in enumerate(dirs):
+        rel = os.path.relpath(dir_path, index.folder).replace(os.sep, '/')
+        encoded = rel.encode('utf-8', 'surrogateescape')
+        INDEX_DIR.pack_into(dir_records, dir_id * INDEX_DIR.size,
+                            len(strings), len(encoded), index.dir_mtimes.get(dir_path, -1))
+        strings += encoded
+    
+    # File names are already one UTF-8 buffer
+    names_base = len(strings)
+    strings += index.name_data
+    count = len(index)
+    file_records = bytearray(INDEX_FILE.size * count)
+    offsets = index.name_offsets
+    for i in range(count):
+        INDEX_FILE.pack_into(file_records, i * INDEX_FILE.size, index.dir_ids[i],
+                             names_base + offsets[i], offsets[i + 1] - offsets[i], index.numbers[i])
+    
+    dirs_offset = INDEX_HEADER.size
+    files_offset = dirs_offset + len(dir_records)
+    strings_offset = files_offset + len(file_records)
+    header = INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, 0, len(dirs), count,
+                               dirs_offset, files_offset, strings_offset, len(strings))
+    
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(header)
+            f.write(dir_records)
+            f.write(file_records)
+            f.write(strings)
+            f.flush()
+            os.fsync(f.fileno())
+        # Clients only map the file while checking it (see MappedEpisodeIndex.detach),
+        # but on Windows this still fails during that window; try again next scan
+        os.replace(tmp_path, path)
+        return True
+    except OSError as e:
+        print(f"Error writing shared index: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+
+class MappedEpisodeIndex:
+    """Read-only episode index backed by a memory-mapped index file
+
+    Offers the same lookups as EpisodeIndex without loading the file:
+    each access unpacks one fixed-width record. Once the staleness check
+    has passed, detach() copies the file into memory so other clients can
+    replace it (Windows refuses to replace a mapped file).
+    """
+    def __init__(self, path, folder):
+        self.folder = folder
+        with open(path, 'rb') as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (magic, version, _, self.dir_count, self.file_count, self.dirs_offset,
+             self.files_offset, self.strings_offset, strings_size) = INDEX_HEADER.unpack_from(self.mm, 0)
+            if magic != INDEX_MAGIC or version != INDEX_VERSION:
+                raise ValueError("not a PARE index file (or unsupported version)")
+            if self.strings_offset + strings_size > len(self.mm):
+                raise ValueError("truncated index file")
+        except Exception:
+            self.mm.close()
+            raise
+        self._dir_paths = {}
+    
+    @classmethod
+    def open(cls, path, folder):
+        """Open an index file, None if missing or invalid"""
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            return cls(path, folder)
+        except (OSError, ValueError, struct.error) as e:
+            print(f"Error opening shared index: {e}")
+            return None
+    
+    def detach(self):
+        """Copy the index into memory and release the mapping and file handle"""
+        if isinstance(self.mm, mmap.mmap):
+            mapped = self.mm
+            self.mm = mapped[:]
+            mapped.close()
+    
+    def close(self):
+        """Release the mapping (a detached copy stays readable until dropped)"""
+        if isinstance(self.mm, mmap.mmap):
+            self.mm.close()
+    
+    def _string(self, offset, length):
+        start = self.strings_offset + offset
+        return self.mm[start:start + length].decode('utf-8', 'surrogateescape')
+    
+    def _dir(self, dir_id):
+        """Relative path and mtime of a directory record"""
+        offset, length, mtime = INDEX_DIR.unpack_from(self.mm, self.dirs_offset + dir_id * INDEX_DIR.size)
+        return self._string(offset, length), mtime
+    
+    def _file(self, i):
+        if not 0 <= i < self.file_count:
+            raise IndexError(i)
+        return INDEX_FILE.unpack_from(self.mm, self.files_offset + i * INDEX_FILE.size)
+    
+    def dir_path(self, dir_id):
+        """Full path of a directory for this client's folder"""
+        path = self._dir_paths.get(dir_id)
+        if path is None:
+            rel = self._dir(dir_id)[0]
+            path = os.path.normpath(os.path.join(self.folder, *rel.split('/')))
+            self._dir_paths[dir_id] = path
+        return path
+    
+    def is_stale(self):
+        """True if any indexed directory changed (or vanished) since export"""
+        for dir_id in range(self.dir_count):
+            rel, mtime = self._dir(dir_id)
+            try:
+                current = os.stat(os.path.join(self.folder, *rel.split('/'))).st_mtime_ns
+            except OSError:
+                return True
+            # Compare at millisecond precision: SMB clients round differently
+            if current // 1000000 != mtime // 1000000:
+                return True
+        return False
+    
+    def __len__(self):
+        return self.file_count
+    
+    def __getitem__(self, i):
+        return self.path(i)
+    
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.path(i)
+    
+    def name(self, i):
+        _, offset, length, _ = self._file(i)
+        return self._string(offset, length)
+    
+    def path(self, i):
+        dir_id, offset, length, _ = self._file(i)
+        return os.path.join(self.dir_path(dir_id), self._string(offset, length))
+    
+    def season_episode(self, i):
+        return unpack_episode(self._file(i)[3])
+    
+    def random_entry(self, rng=random):
+        if not len(self):
+            return None
+        return rng.randrange(len(self))
+    
+    def _records(self):
+        end = self.files_offset + self.file_count * INDEX_FILE.size
+        return INDEX_FILE.iter_unpack(self.mm[self.files_offset:end])
+    
+    def entries_by_number(self):
+        """Map packed season/episode to entry ids"""
+        lookup = {}
+        for i, (_, _, _, packed) in enumerate(self._records()):
+            if packed:
+                lookup.setdefault(packed, []).append(i)
+        return lookup
+    
+    def dir_counts(self):
+        """Recursive video counts per directory, keyed by path relative to the folder"""
+        per_dir = {}
+        for dir_id, _, _, _ in self._records():
+            per_dir[dir_id] = per_dir.get(dir_id, 0) + 1
+        
+        counts = {}
+        for dir_id, count in per_dir.items():
+            rel = os.path.normpath(self._dir(dir_id)[0])
+            while True:
+                counts[rel] = counts.get(rel, 0) + count
+                if rel == '.':
+                    break
+                rel = os.path.dirname(rel) or '.'
+        return counts
+
+# Per-folder directory counts from the last full scan
+DIR_COUNTS_FILE = os.path.join(CACHE_DIR, 'dir_counts.json')
+
+def load_dir_counts(folder):
+    """Load cached directory counts for a folder"""
+    if os.path.exists(DIR_COUNTS_FILE):
+        try:
+            with open(DIR_COUNTS_FILE, 'r') as f:
+                return json.load(f).get(os.path.abspath(folder), {})
+        except Exception as e:
+            print(f"Error loading directory counts: {e}")
+    return {}
+
+def save_dir_counts(folder, counts):
+    """Save directory counts for a folder"""
+    try:
+        data = {}
+        if os.path.exists(DIR_COUNTS_FILE):
+            with open(DIR_COUNTS_FILE, 'r') as f:
+                data = json.load(f)
+        data[os.path.abspath(folder)] = counts
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = DIR_COUNTS_FILE + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, DIR_COUNTS_FILE)
+    except Exception as e:
+        print(f"Error saving directory counts: {e}")
+
+# Seconds between partial directory count updates during a scan
+SCAN_COUNTS_INTERVAL = 2.0
+
+def sample_episode(folder, counts=None, rng=random, time_budget=1.0, max_depth=16):
+    """Pick a random video without scanning the whole library
+
+    Walks down from the folder, choosing between the videos in the current
+    directory and each subdirectory by its known recursive count (or a
+    cheap estimate from one directory listing). With exact counts the pick
+    is uniform. Returns None if nothing was found within the time budget.
+    """
+    counts = counts or {}
+    deadline = time.monotonic() + time_budget
+    dead_ends = set()
+    
+    def listing(path):
+        files, subdirs = [], []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        subdirs.append(entry.name)
+                    elif entry.name.lower().endswith(VIDEO_EXTENSIONS):
+                        files.append(entry.name)
+                except OSError:
+                    pass
+        return files, subdirs
+    
+    def estimate(path, rel):
+        if rel in counts:
+            return counts[rel]
+        # Not counted yet (new, or not reached by a running scan): peek while time allows
+        if time.monotonic() > deadline - time_budget / 2:
+            return 1
+        # Peek one level down
+        try:
+            files, subdirs = listing(path)
+        except OSError:
+            return 0
+        return max(1, len(files) + len(subdirs))
+    
+    while time.monotonic() < deadline:
+        path, rel = folder, '.'
+        for _ in range(max_depth):
+            try:
+                files, subdirs = listing(path)
+            except OSError:
+                dead_ends.add(rel)
+                break
+            
+            choices = [None] if files else []
+            weights = [len(files)] if files else []
+            for name in subdirs:
+                sub_rel = name if rel == '.' else os.path.join(rel, name)
+                if sub_rel not in dead_ends:
+                    weight = estimate(os.path.join(path, name), sub_rel)
+                    if weight > 0:
+                        choices.append(name)
+                        weights.append(weight)
+            
+            if not choices:
+                dead_ends.add(rel)
+                break
+            
+            choice = rng.choices(choices, weights=weights)[0]
+            if choice is None:
+                return os.path.join(path, rng.choice(files))
+            path = os.path.join(path, choice)
+            rel = choice if rel == '.' else os.path.join(rel, choice)
+        
+        if '.' in dead_ends:
+            break
+    return None
+
+def benchmark_index_memory(count=500000, seasons=20, series_folder=r"D:\Videos\TV SERIES\Some Long Series Name"):
+    """Compare memory of a list of paths with EpisodeIndex on a synthetic library"""
+    import gc
+    import tracemalloc
+    
+    per_season = max(1, count // seasons)
+    
+    def names():
+        for i in range(count):
+            season, episode = i // per_season + 1, i % per_season + 1
+            folder = os.path.join(series_folder, f"Season {season:02d}")
+            yield folder, f"Some Long Series Name - S{season:02d}E{episode:03d} - Episode Title 1080p WEB-DL.mkv"
+    
+    results = {'count': count}
+    
+    gc.collect()
+    tracemalloc.start()
+    paths = [os.path.join(folder, name) for folder, name in names()]
+    results['list_bytes'] = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del paths
+    
+    gc.collect()
+    tracemalloc.start()
+    index = EpisodeIndex(series_folder)
+    for folder, name in names():
+        index.add(index.add_dir(folder), name)
+    results['index_bytes'] = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    
+    results['ratio'] = round(results['list_bytes'] / max(1, results['index_bytes']), 1)
+    return results
+
+class Task:
+    """Handle for a background task: cancellation and progress reporting"""
+    def __init__(self, runner, on_progress=None):
+        self.runner = runner
+        self.on_progress = on_progress
+        self.cancelled = threading.Event()
+    
+    def cancel(self):
+        """Request cancellation; pending callbacks are dropped"""
+        self.cancelled.set()
+    
+    def is_cancelled(self):
+        """Check for cancellation (call regularly from the worker)"""
+        return self.cancelled.is_set()
+    
+    def progress(self, value):
+        """Report progress from the worker"""
+        if self.on_progress and not self.is_cancelled():
+            self.runner.post(self, self.on_progress, value)
+
+class TaskRunner:
+    """Run work in a worker pool and deliver results on the Tk thread
+
+    Workers never touch Tk: results, errors and progress go through a
+    queue that the Tk thread drains with window.after.
+    """
+    def __init__(self, window, max_workers=4, poll_ms=50):
+        self.window = window
+        self.poll_ms = poll_ms
+        self.results = Queue()
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='task')
+        self.active = set()
+        self.lock = threading.Lock()
+        self.window.after(self.poll_ms, self.drain)
+    
+    def submit(self, fn, *args, on_done=None, on_error=None, on_progress=None):
+        """Run fn(task, *args) in the pool, returns the Task"""
+        task = Task(self, on_progress)
+        
+        def run():
+            try:
+                if task.is_cancelled():
+                    return
+                try:
+                    result = fn(task, *args)
+                except Exception as e:
+                    if on_error:
+                        self.post(task, on_error, e)
+                    else:
+                        print(f"Background task failed: {e}")
+                else:
+                    if on_done:
+                        self.post(task, on_done, result)
+            finally:
+                with self.lock:
+                    self.active.discard(task)
+        
+        with self.lock:
+            self.active.add(task)
+        self.pool.submit(run)
+        return task
+    
+    def post(self, task, callback, value):
+        """Queue callback(value) for the Tk thread"""
+        self.results.put((task, callback, value))
+    
+    def drain(self):
+        """Tk thread: run queued callbacks"""
+        while True:
+            try:
+                task, callback, value = self.results.get_nowait()
+            except Empty:
+                break
+            if task.is_cancelled():
+                continue
+            try:
+                callback(value)
+            except Exception as e:
+                print(f"Task callback failed: {e}")
+        
+        try:
+            self.window.after(self.poll_ms, self.drain)
+        except tk.TclError:
+            # Window destroyed
+            self.shutdown()
+    
+    def shutdown(self):
+        """Cancel running tasks and stop the worker pool without waiting
+
+        Workers still finish their current step (Python joins pool threads
+        at exit), so tasks should check is_cancelled() regularly.
+        """
+        with self.lock:
+            for task in self.active:
+                task.cancel()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+_http_local = threading.local()
+
+def http_session():
+    """Per-thread HTTP session (keeps connections alive)"""
+    session = getattr(_http_local, 'session', None)
+    if session is None:
+        session = requests.Session()
+        _http_local.session = session
+    return session
+
+# TVDB API
+TVDB_API_URL = "https://api4.thetvdb.com/v4"
+
+class TVDBError(Exception):
+    """TVDB request failed"""
+
+class TokenBucket:
+    """Thread-safe token bucket rate limiter"""
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(1.0, self.rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a token is available"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+class TVDBClient:
+    """TVDB API client with rate limiting, retries and conditional requests"""
+    def __init__(self, api_key, base_url=TVDB_API_URL, rate_limit=5.0, max_retries=4,
+                 backoff=1.0, max_backoff=60.0, timeout=10):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip('/')
+        self.bucket = TokenBucket(rate_limit)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.token_lock = threading.Lock()
+        self._token = None
+    
+    def _retry_delay(self, attempt, response):
+        """Delay before the next attempt: Retry-After, else jittered exponential backoff"""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after:
+                try:
+                    return min(self.max_backoff, max(0.0, float(retry_after)))
+                except ValueError:
+                    pass
+        delay = min(self.max_backoff, self.backoff * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.0)
+    
+    def _send(self, method, path, retries=None, timeout=None, **kwargs):
+        """Rate-limited request, retried on 429/5xx and connection errors"""
+        retries = self.max_retries if retries is None else retries
+        timeout = self.timeout if timeout is None else timeout
+        url = self.base_url + path
+        attempt = 0
+        while True:
+            self.bucket.acquire()
+            response = None
+            try:
+                response = http_session().request(method, url, timeout=timeout, **kwargs)
+                if response.status_code != 429 and response.status_code < 500:
+                    return response
+                error = f"HTTP {response.status_code}"
+            except requests.RequestException as e:
+                error = str(e)
+            
+            if attempt >= retries:
+                raise TVDBError(f"{method} {path} failed after {attempt + 1} attempts: {error}")
+            time.sleep(self._retry_delay(attempt, response))
+            attempt += 1
+    
+    def token(self, retries=None, timeout=None):
+        """Get (and cache) authentication token"""
+        with self.token_lock:
+            if self._token:
+                return self._token
+            response = self._send('POST', '/login', retries=retries, timeout=timeout, json={"apikey": self.api_key})
+            if response.status_code != 200:
+                raise TVDBError(f"Login failed: HTTP {response.status_code}")
+            self._token = response.json()['data']['token']
+            return self._token
+    
+    def get(self, path, params=None, etag=None, last_modified=None, retries=None, timeout=None):
+        """GET an API path, returns the 200 or 304 response
+
+        Foreground callers pass retries=0 and a short timeout: no backoff
+        or Retry-After sleeps then.
+        """
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        
+        for reauth in (True, False):
+            headers['Authorization'] = f"Bearer {self.token(retries, timeout)}"
+            response = self._send('GET', path, retries=retries, timeout=timeout, params=params, headers=headers)
+            if response.status_code == 401 and reauth:
+                # Token expired
+                with self.token_lock:
+                    self._token = None
+                continue
+            break
+        
+        if response.status_code not in (200, 304):
+            raise TVDBError(f"GET {path}: HTTP {response.status_code}")
+        return response
+
+# Lookups the user is waiting for: one attempt, short timeout
+FOREGROUND_TIMEOUT = 5
+
+# One client per API key so the rate limit is shared
+_tvdb_clients = {}
+_tvdb_clients_lock = threading.Lock()
+
+def get_tvdb_client(api_key, rate_limit=5.0):
+    """Get the shared TVDB client for an API key"""
+    with _tvdb_clients_lock:
+        client = _tvdb_clients.get(api_key)
+        if client is None:
+            client = TVDBClient(api_key, rate_limit=rate_limit)
+            _tvdb_clients[api_key] = client
+        return client
+
 def get_tvdb_token(api_key):
     """Get TVDB authentication token"""
     try:
-        url = "https://api4.thetvdb.com/v4/login"
-        headers = {"Content-Type": "application/json"}
-        data = {"apikey": api_key}
-        response = requests.post(url, json=data, headers=headers, timeout=5)
-        
-        if response.status_code == 200:
-            return response.json()['data']['token']
+        return get_tvdb_client(api_key).token(retries=0, timeout=FOREGROUND_TIMEOUT)
     except Exception as e:
         print(f"Error getting TVDB token: {e}")
     return None
 
+# Episode fields kept in the metadata cache
+EPISODE_FIELDS = ('name', 'overview', 'aired', 'runtime', 'image', 'averageRating')
+
+# Metadata cache file
+METADATA_FILE = os.path.join(CACHE_DIR, 'metadata.json')
+
+class MetadataCache:
+    """On-disk cache of TVDB series metadata"""
+    def __init__(self, path=METADATA_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.series = {}
+        self.listeners = []
+        self.load()
+    
+    def subscribe(self, listener):
+        """Call listener(series_id, {key: record}) when episodes change"""
+        self.listeners.append(listener)
+    
+    def _notify(self, series_id, episodes):
+        for listener in self.listeners:
+            try:
+                listener(str(series_id), episodes)
+            except Exception as e:
+                print(f"Metadata listener failed: {e}")
+    
+    def load(self):
+        """Load cache from file"""
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r') as f:
+                    self.series = json.load(f)
+            except Exception as e:
+                print(f"Error loading metadata cache: {e}")
+    
+    def save(self):
+        """Save cache to file"""
+        with self.lock:
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                tmp_path = self.path + '.tmp'
+                with open(tmp_path, 'w') as f:
+                    json.dump(self.series, f)
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                print(f"Error saving metadata cache: {e}")
+    
+    def get_series(self, series_id):
+        """Get a copy of the cached entry for a series"""
+        with self.lock:
+            entry = self.series.get(str(series_id))
+            return json.loads(json.dumps(entry)) if entry else {}
+    
+    def get_episode(self, series_id, season, episode):
+        """Get cached episode record, or None"""
+        with self.lock:
+            entry = self.series.get(str(series_id))
+            if entry:
+                return entry['episodes'].get(f"{season}x{episode}")
+        return None
+    
+    def put_episode(self, series_id, season, episode, record):
+        """Store a single episode record"""
+        with self.lock:
+            entry = self.series.setdefault(str(series_id), {'pages': {}, 'episodes': {}})
+            entry['episodes'][f"{season}x{episode}"] = record
+        self._notify(series_id, {f"{season}x{episode}": record})
+    
+    def put_series(self, series_id, entry, updated=None):
+        """Replace the cached entry for a series (updated: the episodes that changed)"""
+        with self.lock:
+            self.series[str(series_id)] = entry
+        self._notify(series_id, entry['episodes'] if updated is None else updated)
+
+_metadata_cache = None
+
+def get_metadata_cache():
+    """Get the shared metadata cache"""
+    global _metadata_cache
+    if _metadata_cache is None:
+        _metadata_cache = MetadataCache()
+    return _metadata_cache
+
+def episode_record(ep_data):
+    """Keep the cached fields of a TVDB episode"""
+    return {field: ep_data.get(field) for field in EPISODE_FIELDS}
+
 def fetch_episode_info(api_key, series_id, season, episode):
-    """Fetch episode info from TVDB"""
+    """Fetch episode info from TVDB (served from the metadata cache when possible)"""
     if not api_key or not series_id:
         return {
             'title': f'Season {season}, Episode {episode}',
@@ -154,34 +1316,40 @@ def fetch_episode_info(api_key, series_id, season, episode):
             'rating': 'N/A'
         }
     
-    token = get_tvdb_token(api_key)
-    if not token:
-        return {
-            'title': f'Season {season}, Episode {episode}',
-            'description': 'Could not authenticate with TVDB.',
-            'air_date': 'Unknown',
-            'rating': 'N/A'
-        }
-    
-    try:
-        url = f"https://api4.thetvdb.com/v4/series/{series_id}/episodes/default"
-        headers = {"Authorization": f"Bearer {token}"}
-        params = {"season": season, "episodeNumber": episode}
-        
-        response = requests.get(url, headers=headers, params=params, timeout=5)
+    cache = get_metadata_cache()
+    ep_data = cache.get_episode(series_id, season, episode)
+    if ep_data is None:
+        token = get_tvdb_token(api_key)
+        if not token:
+            return {
+                'title': f'Season {season}, Episode {episode}',
+                'description': 'Could not authenticate with TVDB.',
+                'air_date': 'Unknown',
+                'rating': 'N/A'
+            }
         
-        if response.status_code == 200:
+        try:
+            params = {"season": season, "episodeNumber": episode}
+            response = get_tvdb_client(api_key).get(
+                f"/series/{series_id}/episodes/default", params=params,
+                retries=0, timeout=FOREGROUND_TIMEOUT
+            )
             data = response.json()
             if data.get('data') and len(data['data']['episodes']) > 0:
-                ep_data = data['data']['episodes'][0]
-                return {
-                    'title': ep_data.get('name', 'Unknown'),
-                    'description': ep_data.get('overview', 'No description available.'),
-                    'air_date': ep_data.get('aired', 'Unknown'),
-                    'rating': ep_data.get('averageRating', 'N/A')
-                }
-    except Exception as e:
-        print(f"Error fetching TVDB data: {e}")
+                ep_data = episode_record(data['data']['episodes'][0])
+                cache.put_episode(series_id, season, episode, ep_data)
+                cache.save()
+        except Exception as e:
+            print(f"Error fetching TVDB data: {e}")
+    
+    if ep_data is not None:
+        return {
+            'title': ep_data.get('name') or 'Unknown',
+            'description': ep_data.get('overview') or 'No description available.',
+            'air_date': ep_data.get('aired') or 'Unknown',
+            'rating': ep_data.get('averageRating') or 'N/A',
+            'image': ep_data.get('image')
+        }
     
     return {
         'title': f'Season {season}, Episode {episode}',
@@ -190,6 +1358,961 @@ def fetch_episode_info(api_key, series_id, season, episode):
         'rating': 'N/A'
     }
 
+# Series poster URLs, looked up once per series
+_series_posters = {}
+
+def fetch_series_poster_url(api_key, series_id):
+    """Fetch series poster URL from TVDB"""
+    if not api_key or not series_id:
+        return None
+    if series_id in _series_posters:
+        return _series_posters[series_id]
+    
+    try:
+        response = get_tvdb_client(api_key).get(f"/series/{series_id}", retries=1)
+        poster = (response.json().get('data') or {}).get('image')
+        _series_posters[series_id] = poster
+        return poster
+    except Exception as e:
+        print(f"Error fetching TVDB series poster: {e}")
+    return None
+
+class LibraryRefresher:
+    """Background scheduler that keeps cached TVDB metadata fresh
+
+    Each series is re-fetched page by page with If-None-Match/If-Modified-Since,
+    so unchanged series cost one 304 per page. Series are refreshed concurrently
+    up to max_concurrency; the client handles rate limiting and backoff. The
+    time of the last complete check is kept in the cache, so a series is
+    fetched at most once per interval across sessions.
+    """
+    def __init__(self, client, cache, series_ids, max_concurrency=4, interval=24 * 3600):
+        self.client = client
+        self.cache = cache
+        self.series_ids = [str(series_id) for series_id in series_ids if series_id]
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self.thread = None
+    
+    def start(self):
+        """Start periodic refresh in a background thread"""
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name='tvdb-refresh', daemon=True)
+            self.thread.start()
+    
+    def stop(self):
+        """Stop after the current refresh"""
+        self.stop_event.set()
+    
+    def _run(self):
+        while not self.stop_event.is_set():
+            self.refresh_all()
+            self.stop_event.wait(self.next_due())
+    
+    def next_due(self):
+        """Seconds until the next series is due for a check"""
+        now = time.time()
+        due = [
+            self.cache.get_series(series_id).get('checked', 0) + self.interval - now
+            for series_id in self.series_ids
+        ]
+        return max(1.0, min(due, default=self.interval))
+    
+    def refresh_all(self, force=False):
+        """Refresh every series, returns {series_id: 'changed'|'unchanged'|'skipped'|'error'}"""
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='tvdb') as pool:
+            futures = {series_id: pool.submit(self.refresh_series, series_id, force) for series_id in self.series_ids}
+            for series_id, future in futures.items():
+                try:
+                    changed = future.result()
+                    results[series_id] = 'skipped' if changed is None else 'changed' if changed else 'unchanged'
+                except Exception as e:
+                    print(f"Error refreshing TVDB series {series_id}: {e}")
+                    results[series_id] = 'error'
+        # Unchanged series still record when they were checked
+        if any(result in ('changed', 'unchanged') for result in results.values()):
+            self.cache.save()
+        return results
+    
+    def refresh_series(self, series_id, force=False):
+        """Conditionally re-fetch all episode pages of a series
+
+        Returns True if anything changed, False if not, and None if the
+        series was checked within the interval (unless force is set).
+        """
+        entry = self.cache.get_series(series_id)
+        if not force and time.time() - entry.get('checked', 0) < self.interval:
+            return None
+        pages = entry.get('pages', {})
+        episodes = entry.get('episodes', {})
+        updated = {}
+        changed = False
+        
+        page = 0
+        while not self.stop_event.is_set():
+            validators = pages.get(str(page), {})
+            response = self.client.get(
+                f"/series/{series_id}/episodes/default",
+                params={"page": page},
+                etag=validators.get('etag'),
+                last_modified=validators.get('last_modified')
+            )
+            
+            if response.status_code == 304:
+                has_next = validators.get('next', False)
+            else:
+                data = response.json()
+                for ep_data in (data.get('data') or {}).get('episodes') or []:
+                    season, number = ep_data.get('seasonNumber'), ep_data.get('number')
+                    if season is not None and number is not None:
+                        key, record = f"{season}x{number}", episode_record(ep_data)
+                        if episodes.get(key) != record:
+                            episodes[key] = updated[key] = record
+                has_next = bool((data.get('links') or {}).get('next'))
+                pages[str(page)] = {
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                    'next': has_next
+                }
+                changed = True
+            
+            if not has_next:
+                checked = time.time()
+                break
+            page += 1
+        else:
+            # Stopped part way: keep the pages fetched, but not as a complete check
+            checked = entry.get('checked', 0)
+        
+        if changed or checked != entry.get('checked', 0):
+            self.cache.put_series(series_id, {
+                'pages': pages,
+                'episodes': episodes,
+                'checked': checked
+            }, updated)
+        return changed
+
+# Full-text search database
+SEARCH_DB = os.path.join(CACHE_DIR, 'search.db')
+
+class EpisodeSearchIndex:
+    """Full-text index over cached TVDB episode names and overviews
+
+    Uses SQLite FTS5 and is kept up to date from MetadataCache change
+    notifications, one episode row at a time.
+    """
+    def __init__(self, path=SEARCH_DB):
+        self.lock = threading.Lock()
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS episodes USING fts5("
+            "key UNINDEXED, series_id UNINDEXED, season UNINDEXED, episode UNINDEXED, "
+            "name, overview, tokenize='unicode61 remove_diacritics 2')"
+        )
+        self.db.commit()
+    
+    def update(self, series_id, episodes):
+        """Insert or replace episode records ({'SxE': record})"""
+        rows = []
+        for key, record in episodes.items():
+            season, episode = (int(n) for n in key.split('x'))
+            rows.append((key, str(series_id), season, episode,
+                         record.get('name') or '', record.get('overview') or ''))
+        with self.lock:
+            self.db.executemany(
+                "DELETE FROM episodes WHERE series_id = ? AND key = ?",
+                [(row[1], row[0]) for row in rows]
+            )
+            self.db.executemany("INSERT INTO episodes VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self.db.commit()
+    
+    def sync(self, cache):
+        """Index any cached series whose row count doesn't match"""
+        for series_id in list(cache.series):
+            episodes = cache.get_series(series_id).get('episodes', {})
+            with self.lock:
+                count = self.db.execute(
+                    "SELECT count(*) FROM episodes WHERE series_id = ?", (series_id,)
+                ).fetchone()[0]
+            if count != len(episodes):
+                with self.lock:
+                    self.db.execute("DELETE FROM episodes WHERE series_id = ?", (series_id,))
+                self.update(series_id, episodes)
+    
+    @staticmethod
+    def build_query(text):
+        """Turn user input into an FTS5 query: "quoted phrases" and prefix terms, all required"""
+        terms = []
+        for phrase, word in re.findall(r'"([^"]+)"|(\S+)', text):
+            if phrase:
+                terms.append('"' + phrase.replace('"', '""') + '"')
+            else:
+                word = word.replace('"', '')
+                if word:
+                    terms.append('"' + word + '"*')
+        return ' '.join(terms)
+    
+    def search(self, series_id, text):
+        """Return [(season, episode)] matching the keywords"""
+        query = self.build_query(text)
+        if not query:
+            return []
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT season, episode FROM episodes WHERE episodes MATCH ? AND series_id = ?",
+                (query, str(series_id))
+            ).fetchall()
+        return [(int(season), int(episode)) for season, episode in rows]
+    
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+_search_index = None
+
+def get_search_index():
+    """Get the shared search index, subscribed to metadata changes"""
+    global _search_index
+    if _search_index is None:
+        cache = get_metadata_cache()
+        _search_index = EpisodeSearchIndex()
+        _search_index.sync(cache)
+        cache.subscribe(_search_index.update)
+    return _search_index
+
+class LibraryStats:
+    """Library statistics kept up to date from the episode index and metadata cache
+
+    Index entries are counted once as they are scanned and TVDB records as
+    they arrive, so a report only walks per-episode aggregates, never the
+    files. Gaps are aired TVDB episodes with no file in the library.
+    """
+    def __init__(self, max_listed=100):
+        self.lock = threading.Lock()
+        self.max_listed = max_listed
+        self.series_id = None
+        self.aired = {}     # packed season/episode -> TVDB air date ('' if unknown)
+        self.runtimes = {}  # packed season/episode -> runtime in minutes
+        self._reset_index(None)
+    
+    def _reset_index(self, index):
+        self.index = index
+        self.scanned = 0
+        self.local = {}     # packed season/episode -> number of files
+        self.unparsed = []  # entry ids without season/episode
+        self.runtime = 0
+        self.runtime_unknown = 0
+    
+    def _add_local(self, packed):
+        self.local[packed] = self.local.get(packed, 0) + 1
+        minutes = self.runtimes.get(packed)
+        if minutes is None:
+            self.runtime_unknown += 1
+        else:
+            self.runtime += minutes
+    
+    def _set_runtime(self, packed, minutes):
+        old = self.runtimes.get(packed)
+        if minutes is None:
+            self.runtimes.pop(packed, None)
+        else:
+            self.runtimes[packed] = minutes
+        count = self.local.get(packed, 0)
+        if count and old != minutes:
+            self.runtime += ((minutes or 0) - (old or 0)) * count
+            self.runtime_unknown += ((minutes is None) - (old is None)) * count
+    
+    def set_series(self, series_id, cache):
+        """Track TVDB data for a series (loads what the cache already has)"""
+        series_id = str(series_id) if series_id else None
+        with self.lock:
+            if series_id == self.series_id:
+                return
+            self.series_id = series_id
+            for packed in list(self.runtimes):
+                self._set_runtime(packed, None)
+            self.aired = {}
+        if series_id:
+            self.update_metadata(series_id, cache.get_series(series_id).get('episodes', {}))
+    
+    def update_metadata(self, series_id, episodes):
+        """MetadataCache listener: fold in changed episode records ({'SxE': record})"""
+        with self.lock:
+            if str(series_id) != self.series_id:
+                return
+            for key, record in episodes.items():
+                packed = pack_episode(*(int(n) for n in key.split('x')))
+                self.aired[packed] = record.get('aired') or ''
+                runtime = record.get('runtime')
+                self._set_runtime(packed, runtime if isinstance(runtime, int) and runtime > 0 else None)
+    
+    def update_index(self, index):
+        """Count index entries added since the last call (a different index starts over)"""
+        with self.lock:
+            if index is not self.index:
+                self._reset_index(index)
+            end = len(index)
+            for i in range(self.scanned, end):
+                packed = pack_episode(*index.season_episode(i))
+                if packed:
+                    self._add_local(packed)
+                else:
+                    self.unparsed.append(i)
+            self.scanned = end
+    
+    def recheck_unparsed(self):
+        """Count entries identified after scanning (e.g. from container tags)"""
+        with self.lock:
+            if self.index is None:
+                return
+            remaining = []
+            for i in self.unparsed:
+                packed = pack_episode(*self.index.season_episode(i))
+                if packed:
+                    self._add_local(packed)
+                else:
+                    remaining.append(i)
+            self.unparsed = remaining
+    
+    def report(self):
+        """Statistics as a JSON-serialisable dict"""
+        today = time.strftime('%Y-%m-%d')
+        with self.lock:
+            seasons = {}
+            def season_entry(season):
+                return seasons.setdefault(season, {
+                    'season': season, 'files': 0, 'episodes': 0, 'tvdb_episodes': 0, 'missing': []
+                })
+            
+            duplicates = 0
+            for packed, count in self.local.items():
+                entry = season_entry(unpack_episode(packed)[0])
+                entry['files'] += count
+                entry['episodes'] += 1
+                duplicates += count > 1
+            
+            for packed, aired in self.aired.items():
+                # Unaired (or undated) episodes aren't gaps yet
+                if not aired or aired > today:
+                    continue
+                season, episode = unpack_episode(packed)
+                entry = season_entry(season)
+                entry['tvdb_episodes'] += 1
+                if packed not in self.local:
+                    entry['missing'].append(episode)
+            
+            for entry in seasons.values():
+                entry['missing'].sort()
+            # Season 0 is TVDB's specials: listed, but not counted as gaps
+            specials = seasons.get(0, {}).get('missing', [])
+            
+            unparsed = []
+            if self.index is not None:
+                folder = self.index.folder
+                unparsed = [os.path.relpath(self.index.path(i), folder) for i in self.unparsed[:self.max_listed]]
+            
+            return {
+                'series_id': self.series_id,
+                'files': self.scanned,
+                'episodes': len(self.local),
+                'duplicates': duplicates,
+                'unparsed': len(self.unparsed),
+                'unparsed_files': unparsed,
+                'missing': sum(len(entry['missing']) for entry in seasons.values()) - len(specials),
+                'missing_specials': len(specials),
+                'runtime_minutes': self.runtime,
+                'runtime_unknown': self.runtime_unknown + len(self.unparsed),
+                'seasons': [seasons[season] for season in sorted(seasons)],
+            }
+
+_library_stats = None
+
+def get_library_stats():
+    """Get the shared library statistics, subscribed to metadata changes"""
+    global _library_stats
+    if _library_stats is None:
+        _library_stats = LibraryStats()
+        get_metadata_cache().subscribe(_library_stats.update_metadata)
+    return _library_stats
+
+def format_stats(report):
+    """Human-readable text for a LibraryStats report"""
+    hours, minutes = divmod(report['runtime_minutes'], 60)
+    lines = [
+        f"Files: {report['files']}  ({report['episodes']} episodes, {report['duplicates']} with duplicates)",
+        f"Runtime: {hours}h {minutes:02d}m" + (f"  (unknown for {report['runtime_unknown']} files)" if report['runtime_unknown'] else ""),
+        f"Missing aired episodes: {report['missing']}" if report['series_id'] else "Missing episodes: configure TVDB to compare",
+        "",
+    ]
+    for entry in report['seasons']:
+        name = 'Specials' if entry['season'] == 0 else f"Season {entry['season']}"
+        line = f"{name}: {entry['files']} files, {entry['episodes']} episodes"
+        if entry['tvdb_episodes']:
+            line += f" ({entry['tvdb_episodes']} aired on TVDB)"
+        if entry['missing']:
+            line += "\n    missing: " + ', '.join(f"E{episode:02d}" for episode in entry['missing'])
+        lines.append(line)
+    
+    if report['unparsed']:
+        lines += ["", f"Unrecognised files: {report['unparsed']}"]
+        lines += [f"    {name}" for name in report['unparsed_files']]
+        if report['unparsed'] > len(report['unparsed_files']):
+            lines.append(f"    … and {report['unparsed'] - len(report['unparsed_files'])} more")
+    return '\n'.join(lines)
+
+# Artwork cache location and display sizes
+ARTWORK_DIR = os.path.join(CACHE_DIR, 'artwork')
+STILL_SIZE = (360, 203)
+POSTER_SIZE = (90, 132)
+
+class ArtworkCache:
+    """Two-level (memory + disk) cache for TVDB artwork
+
+    Images are fetched and decoded in a small worker pool. Decoded images
+    are kept in an in-memory LRU at their display size, raw downloads are
+    kept on disk (size-capped) and revalidated with ETag/Last-Modified.
+    """
+    def __init__(self, cache_dir=ARTWORK_DIR, max_disk_bytes=200 * 1024 * 1024,
+                 max_memory_items=64, max_fetches=4, revalidate_after=7 * 24 * 3600):
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.max_memory_items = max_memory_items
+        self.revalidate_after = revalidate_after
+
+        self.lock = threading.Lock()
+        self.memory = OrderedDict()
+        self.pending = {}
+        self.dirty = False
+        self.pool = ThreadPoolExecutor(max_workers=max_fetches, thread_name_prefix='artwork')
+        self.index_path = os.path.join(cache_dir, 'index.json')
+        self.index = self._load_index()
+
+    def _load_index(self):
+        """Load disk cache index"""
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, 'r') as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"Error loading artwork index: {e}")
+        return {}
+
+    def _save_index(self):
+        """Save disk cache index (caller holds the lock)"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = self.index_path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(self.index, f)
+            os.replace(tmp_path, self.index_path)
+            self.dirty = False
+        except Exception as e:
+            print(f"Error saving artwork index: {e}")
+    
+    def flush(self):
+        """Save use times recorded since the last write"""
+        with self.lock:
+            if self.dirty:
+                self._save_index()
+
+    def get_cached(self, url, size):
+        """Return decoded image from memory, or None (safe on the Tk thread)"""
+        if not url:
+            return None
+        key = (url, size)
+        with self.lock:
+            image = self.memory.get(key)
+            if image is not None:
+                self.memory.move_to_end(key)
+            return image
+
+    def request(self, url, size):
+        """Load image in the background, returns a Future of a PIL image (or None)"""
+        future = Future()
+        if not url:
+            future.set_result(None)
+            return future
+
+        image = self.get_cached(url, size)
+        if image is not None:
+            future.set_result(image)
+            return future
+
+        key = (url, size)
+        with self.lock:
+            if key in self.pending:
+                return self.pending[key]
+            future = self.pool.submit(self.load, url, size)
+            self.pending[key] = future
+        return future
+
+    def load(self, url, size):
+        """Fetch (or revalidate), decode and resize an image (blocking)"""
+        if not url:
+            return None
+        key = (url, size)
+        try:
+            image = self.get_cached(url, size)
+            if image is None:
+                data = self._fetch(url)
+                if data:
+                    image = Image.open(io.BytesIO(data))
+                    # Let JPEG decode at reduced scale when much larger than needed
+                    image.draft('RGB', size)
+                    image = image.convert('RGB')
+                    image.thumbnail(size, Image.Resampling.LANCZOS)
+                    with self.lock:
+                        self.memory[key] = image
+                        self.memory.move_to_end(key)
+                        while len(self.memory) > self.max_memory_items:
+                            self.memory.popitem(last=False)
+            return image
+        except Exception as e:
+            print(f"Error loading artwork {url}: {e}")
+            return None
+        finally:
+            with self.lock:
+                self.pending.pop(key, None)
+
+    def _fetch(self, url):
+        """Return raw image bytes from disk cache or network"""
+        with self.lock:
+            entry = dict(self.index.get(url) or {})
+
+        cached = None
+        if entry:
+            try:
+                with open(os.path.join(self.cache_dir, entry['file']), 'rb') as f:
+                    cached = f.read()
+            except OSError:
+                entry = {}
+
+        now = time.time()
+        if cached is not None and now - entry.get('checked', 0) < self.revalidate_after:
+            self._touch(url, now)
+            return cached
+
+        headers = {}
+        if cached is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        try:
+            response = http_session().get(url, headers=headers, timeout=10)
+        except Exception as e:
+            print(f"Error fetching artwork: {e}")
+            return cached
+
+        if response.status_code == 304 and cached is not None:
+            self._touch(url, now, checked=True)
+            return cached
+        if response.status_code != 200:
+            return cached
+
+        data = response.content
+        filename = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = os.path.join(self.cache_dir, filename + '.tmp')
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, os.path.join(self.cache_dir, filename))
+        except OSError as e:
+            print(f"Error writing artwork cache: {e}")
+            return data
+
+        with self.lock:
+            self.index[url] = {
+                'file': filename,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'checked': now,
+                'used': now,
+                'size': len(data)
+            }
+            self._evict()
+            self._save_index()
+        return data
+
+    def _touch(self, url, now, checked=False):
+        """Record cache use (and revalidation) time
+
+        Use times only matter for eviction, so they are kept in memory and
+        saved with the next write (or flush); revalidations are saved now.
+        """
+        with self.lock:
+            entry = self.index.get(url)
+            if entry:
+                entry['used'] = now
+                self.dirty = True
+                if checked:
+                    entry['checked'] = now
+                    self._save_index()
+
+    def _evict(self):
+        """Drop least recently used files over the disk cap (caller holds the lock)"""
+        total = sum(entry.get('size', 0) for entry in self.index.values())
+        for url, entry in sorted(self.index.items(), key=lambda item: item[1].get('used', 0)):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, entry['file']))
+            except OSError:
+                pass
+            total -= entry.get('size', 0)
+            del self.index[url]
+
+_artwork_cache = None
+
+def get_artwork_cache():
+    """Get the shared artwork cache"""
+    global _artwork_cache
+    if _artwork_cache is None:
+        _artwork_cache = ArtworkCache()
+    return _artwork_cache
+
+def playback_worker_main(conn, window_id, options=('--no-xlib',)):
+    """Child process: run VLC into the UI's video frame and follow its commands
+
+    Commands (tuples from the UI): ('play', path, start_ms),
+    ('queue', paths, start_pos, start_ms), ('pause',), ('resume',),
+    ('seek', ms), ('volume', level), ('next',), ('stop',), ('quit',).
+    Events back: ('status', time_ms, length_ms, playing), ('item', pos),
+    ('ended',), ('error', message).
+    """
+    instance = vlc.Instance(*options)
+    player = instance.media_player_new()
+    if sys.platform.startswith('win'):
+        player.set_hwnd(window_id)
+    else:
+        player.set_xwindow(window_id)
+    
+    list_player = None
+    queue_media = []
+    # Bumped by VLC's event thread, read by the loop below
+    item_counter = [0]
+    reported_item = None
+    ended_sent = False
+    last_status = 0.0
+    
+    def on_item_set(event):
+        item_counter[0] += 1
+    
+    def new_media(path, start_ms):
+        if start_ms > 0:
+            return instance.media_new(path, f':start-time={start_ms / 1000:.3f}')
+        return instance.media_new(path)
+    
+    try:
+        while True:
+            if conn.poll(0.1):
+                cmd, *args = conn.recv()
+                if cmd == 'play':
+                    path, start_ms = args
+                    list_player = None
+                    player.set_media(new_media(path, start_ms))
+                    player.play()
+                    ended_sent = False
+                elif cmd == 'queue':
+                    paths, start_pos, start_ms = args
+                    queue_media = [
+                        new_media(path, start_ms if pos == start_pos else 0)
+                        for pos, path in enumerate(paths)
+                    ]
+                    media_list = instance.media_list_new()
+                    for media in queue_media:
+                        media_list.add_media(media)
+                    list_player = instance.media_list_player_new()
+                    list_player.set_media_player(player)
+                    list_player.set_media_list(media_list)
+                    list_player.event_manager().event_attach(
+                        vlc.EventType.MediaListPlayerNextItemSet, on_item_set
+                    )
+                    item_counter[0] = start_pos - 1
+                    reported_item = None
+                    list_player.play_item_at_index(start_pos)
+                    ended_sent = False
+                elif cmd == 'pause':
+                    player.set_pause(1)
+                elif cmd == 'resume':
+                    player.set_pause(0)
+                elif cmd == 'seek':
+                    player.set_time(int(args[0]))
+                elif cmd == 'volume':
+                    player.audio_set_volume(int(args[0]))
+                elif cmd == 'next':
+                    if list_player:
+                        list_player.next()
+                elif cmd == 'stop':
+                    (list_player or player).stop()
+                elif cmd == 'quit':
+                    break
+            
+            if list_player and item_counter[0] != reported_item and item_counter[0] >= 0:
+                reported_item = item_counter[0]
+                conn.send(('item', reported_item))
+                # Pre-parse the next item before it is needed
+                if reported_item + 1 < len(queue_media):
+                    queue_media[reported_item + 1].parse_with_options(vlc.MediaParseFlag.network, 0)
+            
+            now = time.monotonic()
+            if now - last_status >= 0.25:
+                last_status = now
+                conn.send(('status', player.get_time(), player.get_length(), bool(player.is_playing())))
+            
+            state = (list_player or player).get_state()
+            if state == vlc.State.Ended and not ended_sent:
+                ended_sent = True
+                conn.send(('ended',))
+            elif state == vlc.State.Error and not ended_sent:
+                ended_sent = True
+                conn.send(('error', 'Playback error'))
+    except (EOFError, OSError):
+        # UI process went away
+        pass
+    finally:
+        player.stop()
+        player.release()
+        instance.release()
+
+class RemotePlayer:
+    """UI-side proxy for a playback worker process
+
+    Mirrors the parts of vlc.MediaPlayer that PlayerWindow uses. Commands
+    are sent without waiting for the child; state comes back as events
+    drained by poll() on the Tk thread. If the child dies, it is restarted
+    and playback resumes where it was.
+    """
+    MAX_RESTARTS = 3
+    RESTART_WINDOW = 60
+    
+    def __init__(self):
+        self.ctx = multiprocessing.get_context('spawn')
+        self.process = None
+        self.conn = None
+        self.window_id = None
+        self.closed = False
+        self.restarts = []
+        
+        self.media = None
+        self.volume = 70
+        self.time = 0
+        self.length = 0
+        self.playing = False
+        self.item_pos = 0
+        self.ended = False
+    
+    def start(self, window_id):
+        """Spawn the worker rendering into window_id"""
+        self.window_id = window_id
+        self._spawn()
+    
+    def _spawn(self):
+        parent_conn, child_conn = self.ctx.Pipe()
+        self.process = self.ctx.Process(
+            target=playback_worker_main,
+            args=(child_conn, self.window_id),
+            name='pare-playback',
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        self._send('volume', self.volume)
+    
+    def _send(self, *cmd):
+        if self.conn is None or self.closed:
+            return
+        try:
+            self.conn.send(cmd)
+        except (OSError, ValueError):
+            # Worker gone; poll() restarts it
+            pass
+    
+    def load(self, path):
+        """Play a single file"""
+        self.media = ('play', path)
+        self.time, self.length, self.ended = 0, 0, False
+        self._send('play', path, 0)
+        self.playing = True
+    
+    def load_queue(self, paths):
+        """Play a list of files back to back"""
+        self.media = ('queue', list(paths))
+        self.time, self.length, self.item_pos, self.ended = 0, 0, 0, False
+        self._send('queue', self.media[1], 0, 0)
+        self.playing = True
+    
+    def play(self):
+        if self.media is None:
+            return -1
+        if self.ended:
+            kind, target = self.media
+            if kind == 'play':
+                self.load(target)
+            else:
+                # Replay the last item like the in-process player does; restarting
+                # the queue from item 0 would leave the info panel on the last one
+                self.time, self.length, self.ended = 0, 0, False
+                self._send('queue', target, self.item_pos, 0)
+        else:
+            self._send('resume')
+        self.playing = True
+        return 0
+    
+    def pause(self):
+        self._send('pause')
+        self.playing = False
+    
+    def stop(self):
+        self._send('stop')
+        self.playing = False
+    
+    def next(self):
+        self._send('next')
+        return 0
+    
+    def is_playing(self):
+        return self.playing
+    
+    def get_time(self):
+        return self.time
+    
+    def get_length(self):
+        return self.length
+    
+    def set_time(self, ms):
+        self.time = ms
+        self._send('seek', ms)
+    
+    def audio_set_volume(self, level):
+        self.volume = level
+        self._send('volume', level)
+    
+    def poll(self):
+        """Tk thread: apply worker events, restart the worker if it died"""
+        if self.closed or self.process is None:
+            return
+        try:
+            while self.conn.poll():
+                event, *args = self.conn.recv()
+                if event == 'status':
+                    self.time, self.length, self.playing = args
+                elif event == 'item':
+                    self.item_pos = args[0]
+                elif event == 'ended':
+                    self.ended = True
+                    self.playing = False
+                elif event == 'error':
+                    print(f"Playback worker: {args[0]}")
+        except (EOFError, OSError):
+            pass
+        
+        if not self.process.is_alive():
+            self._restart()
+    
+    def _restart(self):
+        """Respawn a crashed worker and resume playback"""
+        now = time.monotonic()
+        self.restarts = [t for t in self.restarts if now - t < self.RESTART_WINDOW]
+        if len(self.restarts) >= self.MAX_RESTARTS:
+            print("Playback worker keeps crashing, giving up")
+            self.close()
+            return
+        self.restarts.append(now)
+        print(f"Playback worker exited (code {self.process.exitcode}), restarting...")
+        
+        # The old process is dead: reap it and close its pipe before respawning
+        self.process.join()
+        self.conn.close()
+        self._spawn()
+        if self.media is not None:
+            kind, target = self.media
+            if kind == 'play':
+                self._send('play', target, self.time)
+            else:
+                self._send('queue', target, self.item_pos, self.time)
+            if not self.playing:
+                self._send('pause')
+    
+    def close(self):
+        """Stop the worker process (reaped in the background, never blocks the Tk thread)"""
+        if self.closed:
+            return
+        self._send('quit')
+        self.closed = True
+        process, conn = self.process, self.conn
+        self.process = self.conn = None
+        
+        def reap():
+            if process is not None:
+                process.join(timeout=1)
+                if process.is_alive():
+                    process.terminate()
+                    process.join()
+            if conn is not None:
+                conn.close()
+        threading.Thread(target=reap, name='pare-playback-reap', daemon=True).start()
+
+class AssetCache:
+    """UI images decoded once per display size and shared by all windows"""
+    def __init__(self):
+        self.images = {}
+    
+    def get(self, filename, size=None):
+        """PhotoImage for an asset, or None if it can't be loaded"""
+        key = (filename, size)
+        if key not in self.images:
+            photo = None
+            path = get_asset_path(filename)
+            try:
+                if os.path.exists(path):
+                    with Image.open(path) as img:
+                        if size:
+                            img = img.resize(size, Image.Resampling.LANCZOS)
+                        photo = ImageTk.PhotoImage(img)
+            except Exception as e:
+                print(f"Could not load asset {filename}: {e}")
+            self.images[key] = photo
+        return self.images[key]
+    
+    def clear(self):
+        """Drop all images (before the Tk root goes away)"""
+        self.images.clear()
+
+_asset_cache = None
+
+def get_asset_cache():
+    """Get the shared asset cache (needs a Tk root)"""
+    global _asset_cache
+    if _asset_cache is None:
+        _asset_cache = AssetCache()
+    return _asset_cache
+
+def set_window_icon(window, default=False):
+    """Use the PARE logo as window icon"""
+    icon = get_asset_cache().get('logo_solid.png')
+    if icon is not None:
+        try:
+            window.iconphoto(default, icon)
+        except tk.TclError as e:
+            print(f"Could not set window icon: {e}")
+
+_vlc_instance = None
+
+def get_vlc_instance():
+    """Shared libVLC instance; windows only create and release players"""
+    global _vlc_instance
+    if _vlc_instance is None:
+        _vlc_instance = vlc.Instance('--no-xlib')
+    return _vlc_instance
+
 class SettingsWindow:
     """Settings configuration window"""
     def __init__(self, parent, config, on_save):
@@ -198,19 +2321,13 @@ class SettingsWindow:
         
         self.window = tk.Toplevel(parent)
         self.window.title("PARE Settings")
-        self.window.geometry("600x400")
+        self.window.geometry("600x490")
         self.window.configure(bg='#2b2b2b')
         self.window.transient(parent)
         self.window.grab_set()
         
         # Set window icon
-        try:
-            icon_path = get_asset_path('logo_solid.png')
-            if os.path.exists(icon_path):
-                self.icon_img = ImageTk.PhotoImage(file=icon_path)
-                self.window.iconphoto(False, self.icon_img)
-        except:
-            pass
+        set_window_icon(self.window)
         
         self.build_ui()
     
@@ -265,16 +2382,36 @@ class SettingsWindow:
         self.series_id_entry.insert(0, self.config.tvdb_series_id)
         self.series_id_entry.grid(row=3, column=1, pady=10, padx=10)
         
+        # Shared index file (e.g. on the NAS, next to the series)
+        tk.Label(form, text="Shared Index:", bg='#2b2b2b', fg='#FFFFFF', font=('Arial', 11)).grid(row=4, column=0, sticky='w', pady=10)
+        self.shared_index_entry = tk.Entry(form, font=('Arial', 11), width=40)
+        self.shared_index_entry.insert(0, self.config.shared_index_path)
+        self.shared_index_entry.grid(row=4, column=1, pady=10, padx=10)
+        
+        # Playback worker
+        self.worker_var = tk.BooleanVar(value=self.config.playback_worker)
+        tk.Checkbutton(
+            form,
+            text="Play video in a separate process (keeps the app responsive)",
+            variable=self.worker_var,
+            bg='#2b2b2b',
+            fg='#FFFFFF',
+            selectcolor='#3b3b3b',
+            activebackground='#2b2b2b',
+            activeforeground='#FFFFFF',
+            font=('Arial', 10)
+        ).grid(row=5, column=0, columnspan=2, sticky='w', pady=5)
+        
         # Help text
         help_text = tk.Label(
             form,
-            text="Get free TVDB API key at: https://thetvdb.com/api-information\nFind Series ID on TheTVDB website",
+            text="Get free TVDB API key at: https://thetvdb.com/api-information\nFind Series ID on TheTVDB website\nShared Index: optional index file other PARE installs can reuse instead of scanning",
             bg='#2b2b2b',
             fg='#808080',
             font=('Arial', 9),
             justify='left'
         )
-        help_text.grid(row=4, column=0, columnspan=2, pady=10)
+        help_text.grid(row=6, column=0, columnspan=2, pady=10)
         
         # Buttons
         btn_frame = tk.Frame(self.window, bg='#2b2b2b')
@@ -304,36 +2441,120 @@ class SettingsWindow:
             relief='flat'
         ).pack(side='left', padx=10)
     
-    def browse_folder(self):
-        """Browse for series folder"""
-        folder = filedialog.askdirectory(title="Select TV Series Folder")
-        if folder:
-            self.folder_entry.delete(0, tk.END)
-            self.folder_entry.insert(0, folder)
+    def browse_folder(self):
+        """Browse for series folder"""
+        folder = filedialog.askdirectory(title="Select TV Series Folder")
+        if folder:
+            self.folder_entry.delete(0, tk.END)
+            self.folder_entry.insert(0, folder)
+    
+    def save(self):
+        """Save settings"""
+        self.config.series_name = self.series_name_entry.get().strip()
+        self.config.series_folder = self.folder_entry.get().strip()
+        self.config.tvdb_api_key = self.api_key_entry.get().strip()
+        self.config.tvdb_series_id = self.series_id_entry.get().strip()
+        self.config.playback_worker = self.worker_var.get()
+        self.config.shared_index_path = self.shared_index_entry.get().strip()
+        
+        if not self.config.series_folder:
+            messagebox.showerror("Error", "Please select a series folder")
+            return
+        
+        if not os.path.exists(self.config.series_folder):
+            messagebox.showerror("Error", "Series folder does not exist")
+            return
+        
+        self.config.save()
+        self.on_save()
+        self.window.destroy()
+        messagebox.showinfo("Success", "Settings saved successfully!")
+
+class StatsWindow:
+    """Library statistics and health report"""
+    def __init__(self, parent, stats, get_index, tasks):
+        self.stats = stats
+        self.get_index = get_index
+        self.tasks = tasks
+        
+        self.window = tk.Toplevel(parent)
+        self.window.title("PARE Library Stats")
+        self.window.geometry("600x490")
+        self.window.configure(bg='#2b2b2b')
+        self.window.transient(parent)
+        
+        # Set window icon
+        set_window_icon(self.window)
+        
+        self.build_ui()
+        self.refresh()
+    
+    def build_ui(self):
+        """Build stats UI"""
+        tk.Label(
+            self.window,
+            text="📊 Library Stats",
+            font=('Arial', 20, 'bold'),
+            bg='#2b2b2b',
+            fg='#00C8FF'
+        ).pack(pady=20)
+        
+        self.text = tk.Text(
+            self.window,
+            font=('Arial', 11),
+            bg='#1a1a1f',
+            fg='#FFFFFF',
+            relief='flat',
+            wrap='word',
+            padx=10,
+            pady=10
+        )
+        self.text.pack(padx=30, pady=(0, 10), fill='both', expand=True)
+        self.show("Counting…")
+        
+        tk.Button(
+            self.window,
+            text="Refresh",
+            command=self.refresh,
+            bg='#00C8FF',
+            fg='#000000',
+            relief='flat',
+            padx=20
+        ).pack(pady=(0, 15))
+    
+    def show(self, text):
+        self.text.config(state='normal')
+        self.text.delete('1.0', tk.END)
+        self.text.insert('1.0', text)
+        self.text.config(state='disabled')
     
-    def save(self):
-        """Save settings"""
-        self.config.series_name = self.series_name_entry.get().strip()
-        self.config.series_folder = self.folder_entry.get().strip()
-        self.config.tvdb_api_key = self.api_key_entry.get().strip()
-        self.config.tvdb_series_id = self.series_id_entry.get().strip()
-        
-        if not self.config.series_folder:
-            messagebox.showerror("Error", "Please select a series folder")
-            return
+    def refresh(self):
+        """Count any newly scanned files off the Tk thread, then show the report"""
+        # Read the index now: a rescan may have replaced it since the window opened
+        index = self.get_index()
         
-        if not os.path.exists(self.config.series_folder):
-            messagebox.showerror("Error", "Series folder does not exist")
-            return
+        def count(task):
+            if index is not None:
+                self.stats.update_index(index)
+            return self.stats.report()
         
-        self.config.save()
-        self.on_save()
-        self.window.destroy()
-        messagebox.showinfo("Success", "Settings saved successfully!")
+        def done(report):
+            if self.window.winfo_exists():
+                text = format_stats(report)
+                if index is None:
+                    text = "Library scan in progress: counts are updated when it finishes\n\n" + text
+                self.show(text)
+        self.tasks.submit(count, on_done=done)
 
 class PlayerWindow:
     """Video player window"""
-    def __init__(self, parent, episode_path, season, episode, config, on_next=None):
+    def __init__(self, parent, episode_path, season, episode, config, on_next=None, queue=None):
+        # Marathon mode: queue of (path, season, episode), played in this window
+        self.queue = queue or []
+        self.queue_pos = 0
+        if self.queue:
+            episode_path, season, episode = self.queue[0]
+        
         self.episode_path = episode_path
         self.season = season
         self.episode = episode
@@ -341,6 +2562,13 @@ class PlayerWindow:
         self.on_next = on_next
         self.is_seeking = False
         self.is_fullscreen = False
+        self.list_player = None
+        self.items_started = 0
+        self.prefetched = {}
+        self.prefetch_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='prefetch') if self.queue else None
+        self.media = None
+        self.after_ids = {}
+        self.released = False
         
         self.window = tk.Toplevel(parent)
         self.window.bind("<Escape>", self.exit_fullscreen)
@@ -349,22 +2577,22 @@ class PlayerWindow:
         self.window.configure(bg='#1a1a1f')
         
         # Set window icon
-        try:
-            icon_path = get_asset_path('logo_solid.png')
-            if os.path.exists(icon_path):
-                self.icon_img = ImageTk.PhotoImage(file=icon_path)
-                self.window.iconphoto(False, self.icon_img)
-        except:
-            pass
+        set_window_icon(self.window)
         
-        if VLC_AVAILABLE:
-            self.instance = vlc.Instance('--no-xlib')
+        self.remote = VLC_AVAILABLE and config.playback_worker
+        if self.remote:
+            # Decoding happens in a child process
+            self.instance = None
+            self.player = RemotePlayer()
+        elif VLC_AVAILABLE:
+            self.instance = get_vlc_instance()
             self.player = self.instance.media_player_new()
         else:
             self.instance = None
             self.player = None
         
         self.build_ui()
+        self.window.bind('<Destroy>', self.on_destroy)
         self.load_video()
     
     def build_ui(self):
@@ -375,71 +2603,79 @@ class PlayerWindow:
         info_panel.pack_propagate(False)
         self.info_panel = info_panel
         
-        # Series title
+        # Series poster and title
+        header = tk.Frame(info_panel, bg='#2b2b2b')
+        header.pack(pady=20)
+        
+        self.poster_label = tk.Label(header, bg='#2b2b2b', borderwidth=0)
+        self.poster_label.pack(side='left', padx=(0, 10))
+        
         tk.Label(
-            info_panel,
+            header,
             text=f"📺 {self.config.series_name or 'TV Series'}",
             font=('Arial', 18, 'bold'),
             bg='#2b2b2b',
+            fg='#00C8FF',
+            wraplength=260
+        ).pack(side='left')
+        
+        # Episode still
+        self.still_label = tk.Label(info_panel, bg='#2b2b2b', borderwidth=0)
+        self.still_label.pack()
+        
+        # Episode details (updated in place by show_episode)
+        self.episode_frame = tk.Frame(info_panel, bg='#2b2b2b')
+        
+        self.episode_label = tk.Label(
+            self.episode_frame,
+            font=('Arial', 14),
+            bg='#2b2b2b',
+            fg='#808080'
+        )
+        self.episode_label.pack(pady=5)
+        
+        self.title_label = tk.Label(
+            self.episode_frame,
+            font=('Arial', 16, 'bold'),
+            bg='#2b2b2b',
+            fg='#FFFFFF',
+            wraplength=360
+        )
+        self.title_label.pack(pady=10)
+        
+        self.meta_label = tk.Label(
+            self.episode_frame,
+            font=('Arial', 11),
+            bg='#2b2b2b',
             fg='#00C8FF'
-        ).pack(pady=20)
+        )
+        self.meta_label.pack(pady=5)
         
-        # Fetch episode info
-        if self.season and self.episode:
-            info = fetch_episode_info(
-                self.config.tvdb_api_key,
-                self.config.tvdb_series_id,
-                self.season,
-                self.episode
-            )
-            
-            tk.Label(
-                info_panel,
-                text=f"S{self.season:02d}E{self.episode:02d}",
-                font=('Arial', 14),
-                bg='#2b2b2b',
-                fg='#808080'
-            ).pack(pady=5)
-            
-            tk.Label(
-                info_panel,
-                text=info['title'],
-                font=('Arial', 16, 'bold'),
-                bg='#2b2b2b',
-                fg='#FFFFFF',
-                wraplength=360
-            ).pack(pady=10)
-            
-            tk.Label(
-                info_panel,
-                text=f"📅 {info['air_date']}  |  ⭐ {info['rating']}/10",
-                font=('Arial', 11),
-                bg='#2b2b2b',
-                fg='#00C8FF'
-            ).pack(pady=5)
-            
-            tk.Label(
-                info_panel,
-                text="Synopsis:",
-                font=('Arial', 12, 'bold'),
-                bg='#2b2b2b',
-                fg='#FFFFFF'
-            ).pack(pady=(20, 10))
-            
-            desc_text = tk.Text(
-                info_panel,
-                font=('Arial', 10),
-                bg='#3b3b3b',
-                fg='#CCCCCC',
-                wrap='word',
-                height=20,
-                padx=10,
-                pady=10,
-                relief='flat'
-            )
-            desc_text.pack(fill='both', expand=True, padx=10)
-            desc_text.insert('1.0', info['description'])
-            desc_text.config(state='disabled')
+        tk.Label(
+            self.episode_frame,
+            text="Synopsis:",
+            font=('Arial', 12, 'bold'),
+            bg='#2b2b2b',
+            fg='#FFFFFF'
+        ).pack(pady=(20, 10))
+        
+        self.desc_text = tk.Text(
+            self.episode_frame,
+            font=('Arial', 10),
+            bg='#3b3b3b',
+            fg='#CCCCCC',
+            wrap='word',
+            height=20,
+            padx=10,
+            pady=10,
+            relief='flat'
+        )
+        self.desc_text.pack(fill='both', expand=True, padx=10)
+        
+        self.artwork = get_artwork_cache()
+        self.artwork_images = {}
+        self.artwork_futures = []
+        self.show_episode(self.season, self.episode)
         
         # Video panel (right)
         video_panel = tk.Frame(self.window, bg='#1a1a1f')
@@ -501,7 +2737,7 @@ class PlayerWindow:
             
             tk.Button(
                 btn_frame_left,
-                text="⏭ Next Random",
+                text="⏭ Next" if self.queue else "⏭ Next Random",
                 command=self.play_next_episode,
                 font=('Arial', 11, 'bold'),
                 bg='#32DC64',
@@ -574,18 +2810,127 @@ class PlayerWindow:
             self.fullscreen_btn.bind('<Enter>', on_enter_fs)
             self.fullscreen_btn.bind('<Leave>', on_leave_fs)
     
+    def show_episode(self, season, episode, info=None):
+        """Update the info panel for the current episode"""
+        self.season = season
+        self.episode = episode
+        
+        if not (season and episode):
+            self.episode_frame.pack_forget()
+            self.still_label.config(image='')
+            self.load_artwork(None)
+            return
+        
+        if info is None:
+            info = fetch_episode_info(
+                self.config.tvdb_api_key,
+                self.config.tvdb_series_id,
+                season,
+                episode
+            )
+        
+        episode_text = f"S{season:02d}E{episode:02d}"
+        if self.queue:
+            episode_text += f"  ·  {self.queue_pos + 1}/{len(self.queue)}"
+        self.episode_label.config(text=episode_text)
+        self.title_label.config(text=info['title'])
+        self.meta_label.config(text=f"📅 {info['air_date']}  |  ⭐ {info['rating']}/10")
+        
+        self.desc_text.config(state='normal')
+        self.desc_text.delete('1.0', 'end')
+        self.desc_text.insert('1.0', info['description'])
+        self.desc_text.config(state='disabled')
+        
+        self.episode_frame.pack(fill='both', expand=True)
+        self.load_artwork(info.get('image'))
+    
+    def load_artwork(self, still_url):
+        """Show episode still and series poster without blocking the UI"""
+        # Warm cache: show immediately
+        still = self.artwork.get_cached(still_url, STILL_SIZE)
+        if still is not None:
+            self.show_artwork(self.still_label, still)
+            still_future = None
+        else:
+            self.still_label.config(image='')
+            self.still_label.pack_configure(pady=0)
+            still_future = self.artwork.request(still_url, STILL_SIZE)
+        
+        poster_future = None
+        if self.poster_label not in self.artwork_images:
+            api_key = self.config.tvdb_api_key
+            series_id = self.config.tvdb_series_id
+            poster_url = _series_posters.get(series_id)
+            poster = self.artwork.get_cached(poster_url, POSTER_SIZE)
+            if poster is not None:
+                self.show_artwork(self.poster_label, poster)
+            else:
+                poster_future = self.artwork.pool.submit(
+                    lambda: self.artwork.load(fetch_series_poster_url(api_key, series_id), POSTER_SIZE)
+                )
+        
+        polling = bool(self.artwork_futures)
+        self.artwork_futures = [
+            (label, future)
+            for label, future in self.artwork_futures
+            if label is not self.still_label
+        ] + [
+            (label, future)
+            for label, future in ((self.still_label, still_future), (self.poster_label, poster_future))
+            if future is not None
+        ]
+        if self.artwork_futures and not polling:
+            self.schedule('artwork', 50, self.poll_artwork)
+    
+    def poll_artwork(self):
+        """Pick up artwork finished by the worker pool"""
+        remaining = []
+        for label, future in self.artwork_futures:
+            if future.done():
+                try:
+                    image = future.result()
+                except Exception as e:
+                    print(f"Error loading artwork: {e}")
+                    image = None
+                if image is not None:
+                    self.show_artwork(label, image)
+            else:
+                remaining.append((label, future))
+        self.artwork_futures = remaining
+        if remaining:
+            self.schedule('artwork', 50, self.poll_artwork)
+    
+    def show_artwork(self, label, image):
+        """Display a decoded image on a label"""
+        photo = ImageTk.PhotoImage(image)
+        # Keep a reference so Tk doesn't drop the image
+        self.artwork_images[label] = photo
+        label.config(image=photo)
+        if label is self.still_label:
+            label.pack_configure(pady=(0, 10))
+    
     def load_video(self):
         """Load and play video"""
-        if VLC_AVAILABLE and self.player:
-            media = self.instance.media_new(self.episode_path)
-            self.player.set_media(media)
-            
+        if self.remote:
+            self.player.start(self.video_frame.winfo_id())
+            if self.queue:
+                self.player.load_queue([path for path, _, _ in self.queue])
+                self.prefetch(1)
+            else:
+                self.player.load(self.episode_path)
+            self.update_time()
+        elif VLC_AVAILABLE and self.player:
             if sys.platform.startswith('win'):
                 self.player.set_hwnd(self.video_frame.winfo_id())
             else:
                 self.player.set_xwindow(self.video_frame.winfo_id())
             
-            self.player.play()
+            if self.queue:
+                self.load_queue()
+            else:
+                self.media = self.instance.media_new(self.episode_path)
+                self.player.set_media(self.media)
+                self.player.play()
             self.update_time()
         else:
             # Fallback to external VLC
@@ -595,10 +2940,11 @@ class PlayerWindow:
                 if os.path.exists(vlc_exe):
                     print(f"Launching external VLC: {vlc_exe}")
                     # Use absolute path and ensure it's normalized
-                    abs_path = os.path.abspath(self.episode_path)
+                    paths = [path for path, _, _ in self.queue] or [self.episode_path]
+                    abs_paths = [os.path.abspath(path) for path in paths]
                     try:
                         # Add flags to ensure it plays
-                        subprocess.Popen([vlc_exe, '--no-video-title-show', abs_path])
+                        subprocess.Popen([vlc_exe, '--no-video-title-show'] + abs_paths)
                     except Exception as e:
                         messagebox.showerror("Playback Error", f"Failed to launch VLC: {e}")
                 else:
@@ -606,6 +2952,121 @@ class PlayerWindow:
             else:
                 messagebox.showerror("Error", "VLC not found. Please install VLC Media Player.")
     
+    def load_queue(self):
+        """Play the marathon queue through one MediaListPlayer"""
+        self.queue_media = [self.instance.media_new(path) for path, _, _ in self.queue]
+        self.media_list = self.instance.media_list_new()
+        for media in self.queue_media:
+            self.media_list.add_media(media)
+        
+        self.list_player = self.instance.media_list_player_new()
+        self.list_player.set_media_player(self.player)
+        self.list_player.set_media_list(self.media_list)
+        self.list_events = self.list_player.event_manager()
+        self.list_events.event_attach(vlc.EventType.MediaListPlayerNextItemSet, self.on_item_set)
+        self.list_player.play()
+        self.prefetch(1)
+    
+    def on_item_set(self, event):
+        """VLC thread: the list player moved to its next item"""
+        # Only count here; the Tk side picks it up in update_time
+        self.items_started += 1
+    
+    def prefetch(self, pos):
+        """Get the queue item at pos ready before it starts"""
+        if pos >= len(self.queue) or pos in self.prefetched:
+            return
+        path, season, episode = self.queue[pos]
+        
+        # Pre-parse so VLC has probed the file before the switch
+        # (the playback worker does this itself)
+        if not self.remote:
+            self.queue_media[pos].parse_with_options(vlc.MediaParseFlag.network, 0)
+        
+        if season and episode:
+            api_key = self.config.tvdb_api_key
+            series_id = self.config.tvdb_series_id
+            artwork = self.artwork
+            
+            def load():
+                info = fetch_episode_info(api_key, series_id, season, episode)
+                artwork.load(info.get('image'), STILL_SIZE)
+                return info
+            self.prefetched[pos] = self.prefetch_pool.submit(load)
+    
+    def advance_queue(self, pos):
+        """Show the queue item at pos in the info panel"""
+        self.queue_pos = pos
+        self.episode_path, season, episode = self.queue[pos]
+        
+        info = None
+        future = self.prefetched.pop(pos, None)
+        if future is not None and future.done():
+            try:
+                info = future.result()
+            except Exception as e:
+                print(f"Error prefetching episode info: {e}")
+        
+        print(f"Playing: {os.path.basename(self.episode_path)}")
+        self.show_episode(season, episode, info)
+        self.prefetch(pos + 1)
+    
+    def schedule(self, name, ms, callback):
+        """window.after that is cancelled when the window is released"""
+        if not self.released:
+            self.after_ids[name] = self.window.after(ms, callback)
+    
+    def on_destroy(self, event):
+        """Release resources with the window (also on the title bar close button)"""
+        if event.widget is self.window:
+            self.release()
+    
+    def release(self):
+        """Free timers, VLC objects, worker threads/process and images (idempotent)"""
+        if self.released:
+            return
+        self.released = True
+        
+        for after_id in self.after_ids.values():
+            try:
+                self.window.after_cancel(after_id)
+            except tk.TclError:
+                pass
+        self.after_ids.clear()
+        
+        if self.remote:
+            self.player.close()
+        elif self.player is not None:
+            if self.list_player is not None:
+                self.list_events.event_detach(vlc.EventType.MediaListPlayerNextItemSet)
+                self.list_player.stop()
+                self.list_player.release()
+                self.media_list.release()
+                for media in self.queue_media:
+                    media.release()
+                self.queue_media = []
+            self.player.stop()
+            self.player.release()
+            if self.media is not None:
+                self.media.release()
+        self.player = None
+        self.list_player = None
+        self.media = None
+        
+        if self.prefetch_pool is not None:
+            self.prefetch_pool.shutdown(wait=False, cancel_futures=True)
+        self.prefetched.clear()
+        self.artwork_futures = []
+        self.artwork_images.clear()
+    
+    def close(self):
+        """Release resources and close the window"""
+        self.release()
+        try:
+            self.window.destroy()
+        except tk.TclError:
+            pass
+    
     def toggle_fullscreen(self, event=None):
         """Toggle fullscreen mode"""
         self.is_fullscreen = not self.is_fullscreen
@@ -629,6 +3090,13 @@ class PlayerWindow:
     
     def play_next_episode(self):
         """Play next random episode"""
+        if self.queue:
+            if self.queue_pos + 1 >= len(self.queue):
+                print("End of marathon queue")
+            else:
+                (self.player if self.remote else self.list_player).next()
+            return
+        
         print("Playing next random episode...")
         if self.player:
             self.player.stop()
@@ -680,6 +3148,17 @@ class PlayerWindow:
     
     def update_time(self):
         """Update time display and slider"""
+        if self.released:
+            return
+        if self.remote:
+            self.player.poll()
+        
+        # Marathon: item changed since last update (first event is item 0)
+        if self.queue and VLC_AVAILABLE:
+            pos = self.player.item_pos if self.remote else self.items_started - 1
+            if pos > self.queue_pos:
+                self.advance_queue(min(pos, len(self.queue) - 1))
+        
         if self.player:
             current = self.player.get_time()
             total = self.player.get_length()
@@ -697,9 +3176,7 @@ class PlayerWindow:
             
             self.time_label.config(text=f"{current_str} / {total_str}")
         
-        # Check if window still exists before scheduling next update
-        if self.window.winfo_exists():
-            self.window.after(500, self.update_time)
+        self.schedule('update_time', 500, self.update_time)
 
 class MainWindow:
     """Main application window"""
@@ -708,31 +3185,31 @@ class MainWindow:
         
         self.window = tk.Tk()
         self.window.title("PARE - Play A Random Episode")
-        self.window.geometry("650x550")
+        self.window.geometry("650x680")
         self.window.configure(bg='#1a1a1f')
         
-        # Set window icon
-        try:
-            icon_path = get_asset_path('logo_solid.png')
-            if os.path.exists(icon_path):
-                self.icon_img = ImageTk.PhotoImage(file=icon_path)
-                self.window.iconphoto(True, self.icon_img)
-        except Exception as e:
-            print(f"Could not set window icon: {e}")
+        # Set window icon (default for all windows)
+        set_window_icon(self.window, default=True)
         
+        self.refresher = None
+        self.index = None
+        self.dir_counts = {}
+        self.scan_task = None
+        self.marathon_task = None
+        self.pick_task = None
+        self.keyword_task = None
+        self.number_lookup = None
+        self.search_index = None
+        self.stats = get_library_stats()
+        self.tasks = TaskRunner(self.window)
         self.build_ui()
+        self.start_scan()
+        self.start_refresher()
+        self.tasks.submit(lambda task: get_search_index(), on_done=self.on_search_ready)
     
     def build_ui(self):
         """Build main UI"""
-        # Try to load logo (use solid background version)
-        logo_img = None
-        try:
-            if os.path.exists('assets/logo_solid.png'):
-                img = Image.open('assets/logo_solid.png')
-                img = img.resize((140, 140), Image.Resampling.LANCZOS)
-                logo_img = ImageTk.PhotoImage(img)
-        except Exception as e:
-            print(f"Could not load logo: {e}")
+        has_logo = os.path.exists(get_asset_path('logo_solid.png'))
         
         # Settings cog button (top-right corner) - using Unicode
         settings_btn = tk.Button(
@@ -751,6 +3228,25 @@ class MainWindow:
         )
         settings_btn.place(x=595, y=8)
         
+        # Library stats button (left of settings)
+        stats_btn = tk.Button(
+            self.window,
+            text="📊",
+            command=self.open_stats,
+            font=('Arial', 18),
+            bg='#1a1a1f',
+            fg='#808080',
+            relief='flat',
+            cursor='hand2',
+            padx=8,
+            pady=8,
+            borderwidth=0,
+            highlightthickness=0
+        )
+        stats_btn.place(x=545, y=10)
+        stats_btn.bind('<Enter>', lambda e: stats_btn.config(fg='#00C8FF'))
+        stats_btn.bind('<Leave>', lambda e: stats_btn.config(fg='#808080'))
+        
         # Hover effect
         def on_enter(e):
             settings_btn.config(fg='#00C8FF')
@@ -774,7 +3270,7 @@ class MainWindow:
             font=('Arial', 42, 'bold'),
             bg='#1a1a1f',
             fg='#00C8FF'
-        ).pack(pady=(5 if logo_img else 30, 2))
+        ).pack(pady=(5 if has_logo else 30, 2))
         
         tk.Label(
             self.window,
@@ -795,13 +3291,7 @@ class MainWindow:
         
         # Series info
         if self.config.is_configured():
-            episodes = get_all_episodes(self.config.series_folder)
-            info_text = f"📺 {self.config.series_name or 'Series'}\n{len(episodes)} episodes found"
-            
-            # Show VLC warning if applicable
-            if not VLC_AVAILABLE and sys.maxsize > 2**32 and "x86" in (find_vlc() or ""):
-                info_text += "\n\n⚠ VLC Architecture Mismatch\nInstall VLC 64-bit for embedded playback"
-                
+            info_text = self.library_text()
         else:
             info_text = "⚠️ Not configured\nClick Settings to get started"
         
@@ -830,9 +3320,210 @@ class MainWindow:
             pady=15,
             relief='flat',
             cursor='hand2',
-            state='normal' if self.config.is_configured() else 'disabled'
+            state='disabled'
         )
         self.play_btn.pack(pady=10)
+        
+        # Marathon: queue of N random episodes in one player window
+        marathon_frame = tk.Frame(btn_frame, bg='#1a1a1f')
+        marathon_frame.pack(pady=5)
+        
+        self.marathon_count = tk.Spinbox(
+            marathon_frame,
+            from_=2,
+            to=100,
+            width=4,
+            font=('Arial', 12),
+            justify='center'
+        )
+        self.marathon_count.delete(0, tk.END)
+        self.marathon_count.insert(0, '10')
+        self.marathon_count.pack(side='left', padx=(0, 10))
+        
+        self.marathon_btn = tk.Button(
+            marathon_frame,
+            text="🎬 Marathon",
+            command=self.play_marathon,
+            font=('Arial', 11, 'bold'),
+            bg='#00C8FF',
+            fg='#000000',
+            padx=15,
+            pady=5,
+            relief='flat',
+            cursor='hand2',
+            state='disabled'
+        )
+        self.marathon_btn.pack(side='left')
+        
+        # Keyword pick: random episode whose title/synopsis matches
+        search_frame = tk.Frame(btn_frame, bg='#1a1a1f')
+        search_frame.pack(pady=5)
+        
+        self.search_entry = tk.Entry(search_frame, font=('Arial', 12), width=22)
+        self.search_entry.pack(side='left', padx=(0, 10))
+        self.search_entry.bind('<Return>', lambda e: self.play_keyword())
+        
+        self.search_btn = tk.Button(
+            search_frame,
+            text="🔍 Random Match",
+            command=self.play_keyword,
+            font=('Arial', 11, 'bold'),
+            bg='#808080',
+            fg='#000000',
+            padx=15,
+            pady=5,
+            relief='flat',
+            cursor='hand2',
+            state='disabled'
+        )
+        self.search_btn.pack(side='left')
+    
+    def library_text(self):
+        """Series info text for the main window"""
+        if self.scan_task is not None:
+            found = len(self.index) if self.index is not None else 0
+            info_text = f"📺 {self.config.series_name or 'Series'}\nScanning… {found} episodes so far"
+        else:
+            info_text = f"📺 {self.config.series_name or 'Series'}\n{len(self.index or ())} episodes found"
+        
+        # Show VLC warning if applicable
+        if not VLC_AVAILABLE and sys.maxsize > 2**32 and "x86" in (find_vlc() or ""):
+            info_text += "\n\n⚠ VLC Architecture Mismatch\nInstall VLC 64-bit for embedded playback"
+        return info_text
+    
+    def set_play_state(self):
+        """Enable play buttons once episodes are known"""
+        ready = self.config.is_configured() and (self.scan_task is None or bool(self.index))
+        state = 'normal' if ready else 'disabled'
+        self.play_btn.config(state=state)
+        self.marathon_btn.config(state=state)
+        self.search_btn.config(state=state)
+    
+    def start_scan(self):
+        """Scan the library in the background"""
+        if self.scan_task is not None:
+            self.scan_task.cancel()
+            self.scan_task = None
+        if isinstance(self.index, MappedEpisodeIndex):
+            self.index.close()
+        self.index = None
+        self.number_lookup = None
+        if not self.config.is_configured():
+            return
+        
+        folder = self.config.series_folder
+        self.dir_counts = load_dir_counts(folder)
+        # Filled in by the worker; picks can use it as soon as it has entries
+        self.index = EpisodeIndex(folder)
+        
+        shared_path = self.config.shared_index_path
+        series_id = self.config.tvdb_series_id
+        stats = self.stats
+        
+        def scan(task, index):
+            stats.set_series(series_id, get_metadata_cache())
+            
+            # Reuse the shared index unless a directory changed since it was written
+            shared = MappedEpisodeIndex.open(shared_path, folder)
+            if shared is not None:
+                if not shared.is_stale():
+                    print(f"Using shared index: {shared_path}")
+                    shared.detach()
+                    stats.update_index(shared)
+                    return shared, shared.dir_counts(), shared.entries_by_number()
+                shared.close()
+            
+            # Partial directory counts every few seconds refine picks made during the scan
+            last_counts = [time.monotonic()]
+            
+            def progress(count):
+                counts = None
+                if time.monotonic() - last_counts[0] >= SCAN_COUNTS_INTERVAL:
+                    last_counts[0] = time.monotonic()
+                    counts = index.dir_counts()
+                task.progress((count, counts))
+            
+            EpisodeIndex.build(folder, index=index, progress=progress, cancelled=task.is_cancelled)
+            if not task.is_cancelled():
+                stats.update_index(index)
+                # Files without SxxEyy names: try their container tags
+                identify_from_tags(index, TagCache(), cancelled=task.is_cancelled)
+                stats.recheck_unparsed()
+                save_dir_counts(folder, index.dir_counts())
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                write_index_file(local_index_path(folder), index)
+                if shared_path:
+                    write_index_file(shared_path, index)
+            # Full passes over the index happen here, not on the Tk thread
+            return index, index.dir_counts(), index.entries_by_number()
+        
+        self.scan_task = self.tasks.submit(
+            scan, self.index,
+            on_done=self.on_scan_done,
+            on_error=self.on_scan_error,
+            on_progress=self.on_scan_progress
+        )
+        self.info_label.config(text=self.library_text())
+        self.set_play_state()
+    
+    def on_scan_progress(self, value):
+        """Live episode counter while scanning"""
+        count, counts = value
+        if counts:
+            # Partial counts are lower bounds: never lower a cached count
+            merged = dict(self.dir_counts)
+            for rel, partial in counts.items():
+                if partial > merged.get(rel, 0):
+                    merged[rel] = partial
+            self.dir_counts = merged
+        self.info_label.config(text=self.library_text())
+        self.set_play_state()
+    
+    def on_scan_done(self, result):
+        """Scan finished: picks are now uniform over the full index"""
+        self.scan_task = None
+        self.index, self.dir_counts, self.number_lookup = result
+        self.info_label.config(text=self.library_text())
+        self.set_play_state()
+    
+    def on_scan_error(self, error):
+        """Scan failed: keep whatever was indexed so far"""
+        print(f"Library scan failed: {error}")
+        self.scan_task = None
+        self.info_label.config(text=self.library_text())
+        self.set_play_state()
+    
+    def on_search_ready(self, search_index):
+        """Search index opened (and synced with the metadata cache)"""
+        self.search_index = search_index
+    
+    def start_refresher(self):
+        """(Re)start background TVDB metadata refresh"""
+        if self.refresher:
+            self.refresher.stop()
+            self.refresher = None
+        
+        if self.config.tvdb_api_key and self.config.tvdb_series_id:
+            client = get_tvdb_client(self.config.tvdb_api_key, self.config.tvdb_rate_limit)
+            self.refresher = LibraryRefresher(
+                client,
+                get_metadata_cache(),
+                [self.config.tvdb_series_id],
+                max_concurrency=self.config.tvdb_max_concurrency,
+                interval=self.config.tvdb_refresh_hours * 3600
+            )
+            self.refresher.start()
+    
+    def open_stats(self):
+        """Open library stats window"""
+        if not self.config.is_configured():
+            messagebox.showerror("Error", "Please configure settings first")
+            return
+        StatsWindow(self.window, self.stats, self.stats_index, self.tasks)
+    
+    def stats_index(self):
+        """Index for the stats window, None while a scan is still filling it in"""
+        return self.index if self.scan_task is None else None
     
     def open_settings(self):
         """Open settings window"""
@@ -841,13 +3532,14 @@ class MainWindow:
     def on_settings_saved(self):
         """Callback after settings saved"""
         # Update UI
+        self.start_scan()
         if self.config.is_configured():
-            episodes = get_all_episodes(self.config.series_folder)
-            self.info_label.config(text=f"📺 {self.config.series_name or 'Series'}\n{len(episodes)} episodes found")
-            self.play_btn.config(state='normal')
+            self.info_label.config(text=self.library_text())
         else:
             self.info_label.config(text="⚠️ Not configured\nClick Settings to get started")
-            self.play_btn.config(state='disabled')
+        self.set_play_state()
+        
+        self.start_refresher()
     
     def play_random(self, old_window=None):
         """Play a random episode"""
@@ -857,10 +3549,7 @@ class MainWindow:
                 old_window.destroy()
             except:
                 pass
-            # Schedule the next play with a small delay to allow resource cleanup
-            self.window.after(200, lambda: self._play_random_logic())
-            return
-            
+        # The old window released its player on destroy, so no settle delay is needed
         self._play_random_logic()
     
     def _play_random_logic(self):
@@ -869,15 +3558,42 @@ class MainWindow:
             messagebox.showerror("Error", "Please configure settings first")
             return
         
-        episodes = get_all_episodes(self.config.series_folder)
-        
-        if not episodes:
+        if self.scan_task is not None:
+            # Still scanning: sample down the directory tree for a uniform-ish pick.
+            # That lists directories on the share, so it runs off the Tk thread.
+            if self.pick_task is None:
+                self.pick_task = self.tasks.submit(
+                    lambda task, folder, counts: sample_episode(folder, counts),
+                    self.config.series_folder, dict(self.dir_counts),
+                    on_done=self.on_sampled_pick,
+                    on_error=self.on_sample_error
+                )
+            return
+        self.play_index_pick()
+    
+    def on_sampled_pick(self, episode):
+        """Sampled pick done: play it (or fall back to the partial index)"""
+        self.pick_task = None
+        if episode is None:
+            self.play_index_pick()
+            return
+        self.play_episode(episode, *parse_episode_info(os.path.basename(episode)))
+    
+    def on_sample_error(self, error):
+        print(f"Sampling failed: {error}")
+        self.pick_task = None
+        self.play_index_pick()
+    
+    def play_index_pick(self):
+        """Play a uniformly random entry of the (possibly partial) index"""
+        entry = self.index.random_entry() if self.index is not None else None
+        if entry is None:
             messagebox.showerror("Error", "No episodes found in folder")
             return
-        
-        episode = random.choice(episodes)
-        season, ep_num = parse_episode_info(os.path.basename(episode))
-        
+        self.play_episode(self.index.path(entry), *self.index.season_episode(entry))
+    
+    def play_episode(self, episode, season, ep_num):
+        """Open a player window for an episode"""
         print(f"Playing: {os.path.basename(episode)}")
         if season and ep_num:
             print(f"Season {season}, Episode {ep_num}")
@@ -885,11 +3601,201 @@ class MainWindow:
         # Pass self.play_random as the play_next callback
         PlayerWindow(self.window, episode, season, ep_num, self.config, on_next=self.play_random)
     
+    def play_keyword(self):
+        """Play a random episode whose title or synopsis matches the keywords"""
+        text = self.search_entry.get().strip()
+        if not text:
+            return
+        if not (self.config.tvdb_api_key and self.config.tvdb_series_id):
+            messagebox.showerror("Error", "Configure TVDB in settings to search episodes")
+            return
+        if self.search_index is None or not self.index:
+            messagebox.showinfo("Search", "Still loading the library, try again in a moment")
+            return
+        
+        matches = self.search_index.search(self.config.tvdb_series_id, text)
+        index = self.index
+        
+        if self.number_lookup is not None:
+            self.on_keyword_matches(text, index, self.keyword_entries(matches, self.number_lookup))
+        elif self.keyword_task is None:
+            # Partial index while scanning: map numbers to entries off the Tk thread
+            self.keyword_task = self.tasks.submit(
+                lambda task: self.keyword_entries(matches, index.entries_by_number()),
+                on_done=lambda entries: self.on_keyword_matches(text, index, entries),
+                on_error=self.on_keyword_error
+            )
+    
+    @staticmethod
+    def keyword_entries(matches, lookup):
+        """Index entries for (season, episode) search matches"""
+        return [
+            entry
+            for season, episode in matches
+            for entry in lookup.get(pack_episode(season, episode), ())
+        ]
+    
+    def on_keyword_matches(self, text, index, entries):
+        """Play a random entry among the keyword matches"""
+        self.keyword_task = None
+        if not entries:
+            messagebox.showinfo("Search", f'No episodes in your library match "{text}"')
+            return
+        
+        entry = random.choice(entries)
+        episode = index.path(entry)
+        season, ep_num = index.season_episode(entry)
+        print(f"Playing: {os.path.basename(episode)} ({len(entries)} matches for '{text}')")
+        PlayerWindow(self.window, episode, season, ep_num, self.config, on_next=self.play_random)
+    
+    def on_keyword_error(self, error):
+        self.keyword_task = None
+        messagebox.showerror("Error", f"Keyword search failed: {error}")
+    
+    @staticmethod
+    def random_queue(task, count, folder, index, counts=None, time_budget=5.0):
+        """Worker: build a queue of (path, season, episode) random episodes
+
+        While the library is still scanning (counts given) episodes are
+        sampled from the tree, all sharing one time budget.
+        """
+        queue = []
+        if counts is not None:
+            # Still scanning: sample (may repeat an episode)
+            deadline = time.monotonic() + time_budget
+            for _ in range(count):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or task.is_cancelled():
+                    break
+                episode = sample_episode(folder, counts, time_budget=min(1.0, remaining))
+                if episode:
+                    queue.append((episode, *parse_episode_info(os.path.basename(episode))))
+        if not queue and index:
+            for entry in random.sample(range(len(index)), min(count, len(index))):
+                queue.append((index.path(entry), *index.season_episode(entry)))
+        return queue
+    
+    def play_marathon(self):
+        """Play a queue of random episodes back to back"""
+        if not self.config.is_configured():
+            messagebox.showerror("Error", "Please configure settings first")
+            return
+        
+        try:
+            count = max(1, int(self.marathon_count.get()))
+        except ValueError:
+            messagebox.showerror("Error", "Enter the number of episodes for the marathon")
+            return
+        
+        if self.marathon_task is not None:
+            return
+        
+        # Sampling lists directories on the share: keep it off the Tk thread
+        scanning = self.scan_task is not None
+        self.marathon_task = self.tasks.submit(
+            self.random_queue, count, self.config.series_folder, self.index,
+            dict(self.dir_counts) if scanning else None,
+            on_done=self.on_marathon_queue,
+            on_error=self.on_marathon_error
+        )
+        self.marathon_btn.config(text="🎬 Picking…")
+    
+    def on_marathon_queue(self, queue):
+        """Marathon queue built: start playing"""
+        self.marathon_task = None
+        self.marathon_btn.config(text="🎬 Marathon")
+        if not queue:
+            messagebox.showerror("Error", "No episodes found in folder")
+            return
+        
+        print(f"Marathon: {len(queue)} episodes")
+        PlayerWindow(self.window, None, None, None, self.config, queue=queue)
+    
+    def on_marathon_error(self, error):
+        """Marathon queue failed"""
+        self.marathon_task = None
+        self.marathon_btn.config(text="🎬 Marathon")
+        messagebox.showerror("Error", f"Could not pick marathon episodes: {error}")
+    
+    def on_close(self):
+        """Stop background work and close the app"""
+        if self.scan_task is not None:
+            self.scan_task.cancel()
+            self.scan_task = None
+        if self.refresher:
+            self.refresher.stop()
+            self.refresher = None
+        self.tasks.shutdown()
+        if _artwork_cache is not None:
+            _artwork_cache.flush()
+        # Shared images belong to this Tk root
+        get_asset_cache().clear()
+        self.window.destroy()
+    
     def run(self):
         """Start the application"""
+        self.window.protocol('WM_DELETE_WINDOW', self.on_close)
         self.window.mainloop()
 
 if __name__ == "__main__":
+    import argparse
+    
+    # Needed for the playback worker in the frozen executable
+    multiprocessing.freeze_support()
+    
+    parser = argparse.ArgumentParser(description="PARE - Play A Random Episode")
+    parser.add_argument('--benchmark-index', type=int, metavar='N', nargs='?', const=500000,
+                        help="compare episode index memory with a list of paths for N synthetic files")
+    parser.add_argument('--export-index', metavar='FILE',
+                        help="scan the configured series folder and write a shared index file")
+    parser.add_argument('--stats', action='store_true',
+                        help="print library statistics (per-season counts, gaps against TVDB, runtime) as JSON")
+    args = parser.parse_args()
+    
+    if args.export_index:
+        config = Config()
+        if not config.is_configured():
+            print("Series folder not configured")
+            sys.exit(1)
+        index = EpisodeIndex.build(config.series_folder)
+        identify_from_tags(index, TagCache())
+        ok = write_index_file(args.export_index, index)
+        print(f"{len(index)} episodes written to {args.export_index}" if ok else "Export failed")
+        sys.exit(0 if ok else 1)
+    
+    if args.stats:
+        config = Config()
+        if not config.is_configured():
+            print("Series folder not configured")
+            sys.exit(1)
+        stats = get_library_stats()
+        stats.set_series(config.tvdb_series_id, get_metadata_cache())
+        # The shared index, or the one the app left in the cache, unless the library changed
+        index = None
+        for path in (config.shared_index_path, local_index_path(config.series_folder)):
+            index = MappedEpisodeIndex.open(path, config.series_folder)
+            if index is not None and not index.is_stale():
+                break
+            if index is not None:
+                index.close()
+                index = None
+        if index is None:
+            print("No up-to-date index, scanning the library...", file=sys.stderr)
+            index = EpisodeIndex.build(config.series_folder)
+            stats.update_index(index)
+            identify_from_tags(index, TagCache())
+            stats.recheck_unparsed()
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            write_index_file(local_index_path(config.series_folder), index)
+        else:
+            stats.update_index(index)
+        print(json.dumps(stats.report(), indent=4))
+        sys.exit(0)
+    
+    if args.benchmark_index:
+        print(json.dumps(benchmark_index_memory(args.benchmark_index), indent=4))
+        sys.exit(0)
+    
     print("=" * 70)
     print("🎬 PARE - Play A Random Episode")
     print("=" * 70)
@@ -0,0 +1,75 @@
+"""ArtworkCache disk cache and revalidation against a local stub"""
+import io
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from PIL import Image
+
+import pare
+
+
+def jpeg():
+    buf = io.BytesIO()
+    Image.new('RGB', (640, 360), 'red').save(buf, 'JPEG')
+    return buf.getvalue()
+
+
+class StubArtwork(BaseHTTPRequestHandler):
+    data = jpeg()
+    hits = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.hits.append(304)
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.hits.append(200)
+        self.send_response(200)
+        self.send_header('ETag', '"v1"')
+        self.send_header('Content-Length', str(len(self.data)))
+        self.end_headers()
+        self.wfile.write(self.data)
+
+
+@pytest.fixture
+def url():
+    StubArtwork.hits = []
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), StubArtwork)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{httpd.server_port}/still.jpg'
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_disk_hits_do_not_rewrite_the_index(url, tmp_path):
+    cache_dir = str(tmp_path / 'artwork')
+    assert pare.ArtworkCache(cache_dir).load(url, pare.STILL_SIZE).size == pare.STILL_SIZE
+    index_path = os.path.join(cache_dir, 'index.json')
+    written = os.stat(index_path).st_mtime_ns
+
+    # New session: served from disk without a request or an index write
+    cache = pare.ArtworkCache(cache_dir)
+    assert cache.load(url, pare.STILL_SIZE) is not None
+    assert StubArtwork.hits == [200]
+    assert os.stat(index_path).st_mtime_ns == written
+    assert cache.dirty
+
+    cache.flush()
+    with open(index_path) as f:
+        assert f.read() == json.dumps(cache.index)
+    assert not cache.dirty
+
+
+def test_stale_entry_is_revalidated(url, tmp_path):
+    cache_dir = str(tmp_path / 'artwork')
+    pare.ArtworkCache(cache_dir).load(url, pare.STILL_SIZE)
+    cache = pare.ArtworkCache(cache_dir, revalidate_after=0)
+    assert cache.load(url, pare.STILL_SIZE) is not None
+    assert StubArtwork.hits == [200, 304]
@@ -0,0 +1,120 @@
+"""Season/episode tags from synthetic MKV and MP4 headers"""
+import struct
+
+import pare
+
+
+# Matroska (EBML) builders
+
+def ebml_size(n):
+    return bytes([0x08]) + n.to_bytes(4, 'big')
+
+
+def element(element_id, payload):
+    return element_id.to_bytes((element_id.bit_length() + 7) // 8, 'big') + ebml_size(len(payload)) + payload
+
+
+def simple_tag(name, value):
+    return element(pare.MKV_SIMPLE_TAG, element(pare.MKV_TAG_NAME, name.encode()) + element(pare.MKV_TAG_STRING, value.encode()))
+
+
+def tag(target, *simple_tags):
+    targets = element(pare.MKV_TARGETS, element(pare.MKV_TARGET_TYPE_VALUE, bytes([target])))
+    return element(pare.MKV_TAG, targets + b''.join(simple_tags))
+
+
+def seek_head(tags_position):
+    seek = element(pare.MKV_SEEK_ID, pare.MKV_TAGS.to_bytes(4, 'big')) + element(pare.MKV_SEEK_POSITION, tags_position.to_bytes(4, 'big'))
+    return element(pare.MKV_SEEKHEAD, element(pare.MKV_SEEK, seek))
+
+
+def mkv(*tags, title='Segment title'):
+    """EBML header and a segment whose Tags follow a cluster, found via the SeekHead"""
+    info = element(pare.MKV_INFO, element(pare.MKV_TITLE, title.encode()))
+    cluster = element(pare.MKV_CLUSTER, b'\0' * 10000)
+    tags_element = element(pare.MKV_TAGS, b''.join(tags))
+    # The SeekHead has a fixed size, so its own length gives the Tags position
+    head_size = len(seek_head(0))
+    body = seek_head(head_size + len(info) + len(cluster)) + info + cluster + tags_element
+    return element(pare.MKV_EBML, element(0x4282, b'matroska')) + element(pare.MKV_SEGMENT, body)
+
+
+# MP4 builders
+
+def box(kind, payload):
+    return struct.pack('>I4s', 8 + len(payload), kind) + payload
+
+
+def data(payload, type_indicator=21):
+    return box(b'data', struct.pack('>II', type_indicator, 0) + payload)
+
+
+def mp4(full_box_meta=True):
+    ilst = box(b'ilst', (
+        box(b'\xa9nam', data('The Wedding'.encode(), 1))
+        + box(b'covr', data(b'x' * 1000, 13))
+        + box(b'tvsn', data(struct.pack('>I', 2)))
+        + box(b'tves', data(struct.pack('>I', 11)))
+    ))
+    # MP4 meta is a full box (version/flags first); QuickTime meta is not
+    meta = box(b'meta', (b'\0\0\0\0' if full_box_meta else b'') + box(b'hdlr', b'\0' * 25) + ilst)
+    moov = box(b'moov', box(b'mvhd', b'\0' * 100) + box(b'udta', meta))
+    return box(b'ftyp', b'isom') + box(b'mdat', b'\0' * 10000) + moov
+
+
+def write(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_mkv_tags_found_via_seekhead(tmp_path):
+    path = write(tmp_path, 'a.mkv', mkv(
+        tag(60, simple_tag('PART_NUMBER', '3')),
+        tag(50, simple_tag('PART_NUMBER', '7'), simple_tag('TITLE', 'The Wedding')),
+    ))
+    assert pare.read_container_tags(path) == {'season': 3, 'episode': 7, 'title': 'The Wedding'}
+
+
+def test_mkv_segment_title_without_tags(tmp_path):
+    path = write(tmp_path, 'a.mkv', mkv(title='Pilot'))
+    assert pare.read_container_tags(path) == {'title': 'Pilot'}
+
+
+def test_mkv_negative_part_number_is_ignored(tmp_path):
+    path = write(tmp_path, 'a.mkv', mkv(tag(60, simple_tag('PART_NUMBER', '-1')), tag(50, simple_tag('PART_NUMBER', '3'))))
+    assert pare.read_container_tags(path) == {'episode': 3, 'title': 'Segment title'}
+
+
+def test_mp4_tags(tmp_path):
+    path = write(tmp_path, 'a.mp4', mp4())
+    assert pare.read_container_tags(path) == {'season': 2, 'episode': 11, 'title': 'The Wedding'}
+
+
+def test_quicktime_meta_tags(tmp_path):
+    path = write(tmp_path, 'a.mov', mp4(full_box_meta=False))
+    assert pare.read_container_tags(path) == {'season': 2, 'episode': 11, 'title': 'The Wedding'}
+
+
+def test_garbage_and_truncated_files(tmp_path):
+    assert pare.read_container_tags(write(tmp_path, 'a.mp4', b'garbage' * 10)) == {}
+    assert pare.read_container_tags(write(tmp_path, 'b.mkv', b'garbage' * 10)) == {}
+    # Tags element cut off: the Info title before it is still read
+    assert pare.read_container_tags(write(tmp_path, 'c.mkv', mkv(tag(50, simple_tag('PART_NUMBER', '7')))[:200])) == {'title': 'Segment title'}
+    # moov cut off in the last data box: earlier atoms are still read
+    assert pare.read_container_tags(write(tmp_path, 'd.mp4', mp4()[:-6])) == {'season': 2, 'title': 'The Wedding'}
+    assert pare.read_container_tags(write(tmp_path, 'e.mkv', b'')) == {}
+
+
+def test_identify_survives_bad_tags(tmp_path):
+    library = tmp_path / 'library'
+    library.mkdir()
+    write(library, 'bad.mkv', mkv(tag(60, simple_tag('PART_NUMBER', '-1')), tag(50, simple_tag('PART_NUMBER', '3'))))
+    write(library, 'good.mp4', mp4())
+    write(library, 'junk.mkv', b'garbage')
+
+    index = pare.EpisodeIndex.build(str(library))
+    cache = pare.TagCache(str(tmp_path / 'tags.json'))
+    assert pare.identify_from_tags(index, cache) == 1
+    found = {index.name(i): index.season_episode(i) for i in range(len(index))}
+    assert found == {'bad.mkv': (None, None), 'good.mp4': (2, 11), 'junk.mkv': (None, None)}
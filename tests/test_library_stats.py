@@ -0,0 +1,75 @@
+"""LibraryStats aggregates from an index and TVDB records"""
+import pare
+
+
+def make_index(tmp_path, names):
+    for name in names:
+        path = tmp_path / 'library' / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b'')
+    return pare.EpisodeIndex.build(str(tmp_path / 'library'))
+
+
+def record(aired, runtime=30):
+    return {'name': '', 'overview': '', 'aired': aired, 'runtime': runtime, 'image': None, 'averageRating': None}
+
+
+def test_report_counts_gaps_and_runtime(tmp_path):
+    index = make_index(tmp_path, [
+        'Season 1/Show S01E01.mkv', 'Season 1/Show S01E02.mkv', 'Season 1/Show S01E02 copy.mkv',
+        'Season 2/Show 2x01.avi', 'Extras/trailer.mkv',
+    ])
+    cache = pare.MetadataCache(str(tmp_path / 'metadata.json'))
+    cache.put_series('42', {'pages': {}, 'episodes': {
+        '1x1': record('2010-01-01'), '1x2': record('2010-01-08'), '1x3': record('2010-01-15'),
+        '2x1': record('2011-01-01', None), '2x2': record('2999-01-01'),
+        '0x1': record('2010-12-25'),
+    }})
+    stats = pare.LibraryStats()
+    cache.subscribe(stats.update_metadata)
+    stats.set_series('42', cache)
+    stats.update_index(index)
+
+    report = stats.report()
+    assert report['files'] == 5
+    assert report['episodes'] == 3
+    assert report['duplicates'] == 1
+    assert report['unparsed_files'] == ['Extras/trailer.mkv'.replace('/', pare.os.sep)]
+    # 1x3 is a gap; 2x2 hasn't aired; the special is listed separately
+    assert report['missing'] == 1
+    assert report['missing_specials'] == 1
+    seasons = {entry['season']: entry for entry in report['seasons']}
+    assert seasons[1]['missing'] == [3]
+    assert seasons[0]['missing'] == [1]
+    assert report['runtime_minutes'] == 90
+    assert report['runtime_unknown'] == 2
+    assert 'Specials' in pare.format_stats(report)
+
+    # Metadata change notifications update the runtime incrementally
+    cache.put_episode('42', 2, 1, record('2011-01-01', 45))
+    assert stats.report()['runtime_minutes'] == 135
+    assert stats.report()['runtime_unknown'] == 1
+
+
+def test_new_entries_are_counted_once(tmp_path):
+    index = make_index(tmp_path, ['S01E01.mkv'])
+    stats = pare.LibraryStats()
+    stats.update_index(index)
+    index.add(index.add_dir(str(tmp_path / 'library')), 'S01E02.mkv')
+    stats.update_index(index)
+    stats.update_index(index)
+    assert stats.report()['files'] == 2
+    assert stats.report()['episodes'] == 2
+
+
+def test_local_index_file_round_trip(tmp_path):
+    index = make_index(tmp_path, ['Season 1/S01E01.mkv', 'Season 1/S01E02.mkv'])
+    path = str(tmp_path / 'library.idx')
+    assert pare.write_index_file(path, index)
+
+    mapped = pare.MappedEpisodeIndex.open(path, index.folder)
+    assert not mapped.is_stale()
+    stats = pare.LibraryStats()
+    stats.update_index(mapped)
+    assert stats.report()['episodes'] == 2
+    mapped.close()
@@ -0,0 +1,86 @@
+"""Opening and closing player windows must not leak objects"""
+import gc
+import threading
+import tkinter as tk
+
+import pytest
+
+import pare
+
+WINDOWS = 1000
+
+
+@pytest.fixture
+def root(monkeypatch):
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("needs a display (run under xvfb-run)")
+    root.withdraw()
+    # No libVLC: exercise the window lifecycle, never launch an external player
+    monkeypatch.setattr(pare, 'VLC_AVAILABLE', False)
+    monkeypatch.setattr(pare, 'find_vlc', lambda: None)
+    monkeypatch.setattr(pare.messagebox, 'showerror', lambda *args, **kwargs: None)
+    yield root
+    pare.get_asset_cache().clear()
+    root.destroy()
+
+
+@pytest.fixture
+def config():
+    config = pare.Config()
+    config.series_name = "Leak Test"
+    config.tvdb_api_key = ""
+    config.tvdb_series_id = ""
+    config.playback_worker = False
+    return config
+
+
+def cycle(root, config, i):
+    """Open a player window (every other one a marathon) and close it like Next Random does"""
+    if i % 2:
+        queue = [(f"/library/S01E{n:02d}.mkv", 1, n) for n in range(1, 4)]
+        player = pare.PlayerWindow(root, None, None, None, config, queue=queue)
+    else:
+        player = pare.PlayerWindow(root, "/library/S01E01.mkv", 1, 1, config)
+    root.update()
+    player.window.destroy()
+    root.update()
+
+
+def snapshot(root):
+    gc.collect()
+    return {
+        'objects': len(gc.get_objects()),
+        'players': sum(isinstance(obj, pare.PlayerWindow) for obj in gc.get_objects()),
+        'widgets': len(root.winfo_children()),
+        'images': len(root.image_names()),
+        'threads': threading.active_count(),
+    }
+
+
+def test_player_windows_do_not_leak(root, config):
+    # Warm up shared caches and pools before taking the baseline
+    for i in range(20):
+        cycle(root, config, i)
+    before = snapshot(root)
+
+    for i in range(WINDOWS):
+        cycle(root, config, i)
+    after = snapshot(root)
+
+    assert after['players'] == 0
+    assert after['widgets'] == before['widgets']
+    assert after['images'] == before['images']
+    assert after['threads'] <= before['threads']
+    # Flat: well under one surviving object per window
+    assert after['objects'] - before['objects'] < WINDOWS // 10
+
+
+def test_release_is_idempotent(root, config):
+    player = pare.PlayerWindow(root, "/library/S01E01.mkv", 1, 1, config)
+    player.close()
+    player.release()
+    player.close()
+    assert player.released
+    assert not player.after_ids
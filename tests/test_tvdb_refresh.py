@@ -0,0 +1,152 @@
+"""LibraryRefresher and TVDBClient against a local stub that throttles"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import pare
+
+
+class StubTVDB(BaseHTTPRequestHandler):
+    """Two pages of episodes per series; every other GET is throttled with 429"""
+    requests = []
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, code, data, headers=None):
+        body = json.dumps(data).encode()
+        self.send_response(code)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        self.send_json(200, {'data': {'token': 'stub-token'}})
+
+    def do_GET(self):
+        with self.lock:
+            self.requests.append(self.path)
+            throttled = len(self.requests) % 2 == 1
+        if throttled:
+            return self.send_json(429, {}, {'Retry-After': '0.01'})
+
+        series_id = self.path.split('/')[2]
+        page = int(self.path.split('page=')[1])
+        etag = f'"{series_id}-{page}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        episodes = [
+            {'seasonNumber': 1, 'number': page * 2 + i + 1, 'name': f'Episode {page * 2 + i + 1}',
+             'overview': '', 'aired': '2010-01-01', 'runtime': 30}
+            for i in range(2)
+        ]
+        links = {'next': 'more' if page == 0 else None}
+        self.send_json(200, {'data': {'episodes': episodes}, 'links': links}, {'ETag': etag})
+
+
+@pytest.fixture
+def server():
+    StubTVDB.requests = []
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), StubTVDB)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_port}'
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def client(server):
+    return pare.TVDBClient('key', base_url=server, rate_limit=100, backoff=0.01)
+
+
+def test_throttled_requests_are_retried(client):
+    response = client.get('/series/1/episodes/default', params={'page': 0})
+    assert response.status_code == 200
+    assert response.headers['ETag'] == '"1-0"'
+    assert len(StubTVDB.requests) == 2
+
+
+def test_refresh_revalidates_with_etag(client, tmp_path):
+    cache = pare.MetadataCache(str(tmp_path / 'metadata.json'))
+    changes = []
+    cache.subscribe(lambda series_id, episodes: changes.append((series_id, set(episodes))))
+    refresher = pare.LibraryRefresher(client, cache, ['1', '2'], max_concurrency=2, interval=3600)
+
+    assert refresher.refresh_all() == {'1': 'changed', '2': 'changed'}
+    assert cache.get_episode('2', 1, 4)['name'] == 'Episode 4'
+    assert sorted(changes) == [('1', {'1x1', '1x2', '1x3', '1x4'}), ('2', {'1x1', '1x2', '1x3', '1x4'})]
+
+    # Forced recheck: every page answers 304, nothing is reported as changed
+    changes.clear()
+    assert refresher.refresh_all(force=True) == {'1': 'unchanged', '2': 'unchanged'}
+    assert all(not episodes for _, episodes in changes)
+
+
+def test_recent_check_is_kept_across_sessions(client, tmp_path):
+    path = str(tmp_path / 'metadata.json')
+    pare.LibraryRefresher(client, pare.MetadataCache(path), ['1'], interval=3600).refresh_all()
+    fetched = len(StubTVDB.requests)
+
+    # New session with the saved cache: the series is not due yet
+    refresher = pare.LibraryRefresher(client, pare.MetadataCache(path), ['1'], interval=3600)
+    assert refresher.refresh_all() == {'1': 'skipped'}
+    assert len(StubTVDB.requests) == fetched
+    assert 3590 < refresher.next_due() <= 3600
+
+
+def test_interval_elapsed_refreshes_again(client, tmp_path):
+    cache = pare.MetadataCache(str(tmp_path / 'metadata.json'))
+    refresher = pare.LibraryRefresher(client, cache, ['1'], interval=3600)
+    refresher.refresh_all()
+    entry = cache.get_series('1')
+    entry['checked'] = time.time() - 7200
+    cache.put_series('1', entry, {})
+
+    assert refresher.refresh_all() == {'1': 'unchanged'}
+    assert time.time() - cache.get_series('1')['checked'] < 60
+
+
+class ThrottlingTVDB(StubTVDB):
+    """Always busy: 429 with a long Retry-After"""
+
+    def do_GET(self):
+        self.send_json(429, {}, {'Retry-After': '5'})
+
+
+def test_foreground_lookup_does_not_wait_for_retry_after(monkeypatch, tmp_path):
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), ThrottlingTVDB)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    try:
+        client = pare.TVDBClient('key', base_url=f'http://127.0.0.1:{httpd.server_port}')
+        monkeypatch.setitem(pare._tvdb_clients, 'key', client)
+        monkeypatch.setattr(pare, '_metadata_cache', pare.MetadataCache(str(tmp_path / 'metadata.json')))
+
+        start = time.monotonic()
+        info = pare.fetch_episode_info('key', '1', 1, 2)
+        assert time.monotonic() - start < 1
+        assert info['title'] == 'Season 1, Episode 2'
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def test_config_clamps_rate_settings(monkeypatch, tmp_path):
+    path = tmp_path / 'config.json'
+    path.write_text(json.dumps({'tvdb_rate_limit': 0, 'tvdb_max_concurrency': 'lots'}))
+    monkeypatch.setattr(pare, 'CONFIG_FILE', str(path))
+
+    config = pare.Config()
+    assert config.tvdb_rate_limit == 0.1
+    assert config.tvdb_max_concurrency == 4
+    pare.TokenBucket(config.tvdb_rate_limit).acquire()